@@ -6,6 +6,15 @@ import sys
 # import zs_tests.style_tests as st
 # import zs_tests.game_tests as gamt
 # import zs_tests.controller_tests as cont
+# import zs_tests.atlas_tests as at
+# import zs_tests.image_cache_tests as ict
+# import zs_tests.bitmap_font_tests as bft
+# import zs_tests.resource_library_tests as rlt
+# import zs_tests.animations_tests as ant
+# import zs_tests.gui_tests as guit
+# import zs_tests.menus_gui_tests as mgt
+# import zs_tests.debug_utils_tests as dut
+# import zs_tests.profiler_tests as pt
 
 sys.stdout = open("output.txt", "w")
 # ct.do_tests()
@@ -15,5 +24,14 @@ sys.stdout = open("output.txt", "w")
 # st.do_tests()
 # gamt.do_tests()
 # cont.do_tests()
+# at.do_tests()
+# ict.do_tests()
+# bft.do_tests()
+# rlt.do_tests()
+# ant.do_tests()
+# guit.do_tests()
+# mgt.do_tests()
+# dut.do_tests()
+# pt.do_tests()
 
 # sys.stdout.close()
@@ -19,3 +19,5 @@ ANIMATION_STREAMS = join(CONFIG, "animation_streams")
 STYLE_DICTS = join(CONFIG, "style_dicts")
 RESOURCE_DICTS = join(CONFIG, "resource_dicts")
 
+PROFILER_OUTPUT = "profiler_output"
+
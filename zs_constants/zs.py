@@ -10,3 +10,14 @@ TRANSITION_TIME = 6
 TEXT_ANTI_ALIAS = 1
 DIALOG_POSITION = (300, 300)
 CONTROLLERS = ("dev_mode2", "dev_mode", "xbox")
+TEXTURE_ATLAS = 1
+IMAGE_CACHE_BUDGET = 64000000
+TEXT_CACHE_BUDGET = 8000000
+CONTAINER_CACHE_BUDGET = 32000000
+PRE_RENDER_BUDGET = 48000000
+STYLE_CACHE_SIZE = 512
+ASSET_LOADER_THREADS = 4
+FRAME_PROFILER_WINDOW = 120
+FRAME_RECORDER_FRAMES = 3600
+PROFILE_CAPTURE_FRAMES = 120
+PROFILE_CAPTURE_KEY = "f9"
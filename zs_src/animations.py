@@ -1,9 +1,11 @@
+from copy import copy
 from os.path import join
 
 import pygame
 
 from zs_constants.paths import ANIMATIONS, ANIMATION_STREAMS
 from zs_src.graphics import Graphics, ImageSet
+from zs_src.image_cache import get_content_key
 
 
 class AnimationGraphics(Graphics):
@@ -15,11 +17,7 @@ class AnimationGraphics(Graphics):
 
     @staticmethod
     def get_sprite_sheet(name):
-        path = join(ANIMATIONS, name)
-        sprite_sheet = pygame.image.load(path)
-        sprite_sheet.set_colorkey(sprite_sheet.get_at((0, 0)))
-
-        return sprite_sheet
+        return Graphics.load_image(ANIMATIONS, name)
 
     def get_hitbox(self):
         animation = self.get_image_set()
@@ -54,28 +52,35 @@ class AnimationGraphics(Graphics):
         self.image_sets[name] = animation
 
     def set_up_animations(self, stream_file):
-        stream = StreamManager(stream_file)
+        self.stream = StreamManager(stream_file)
 
-        for name in stream.stream_dict:
-            self.set_animation(name, stream)
+        for name in self.stream.stream_dict:
+            self.set_animation(name, self.stream)
 
 
 class LeftRightGraphics(AnimationGraphics):
-    def __init__(self, sprite_sheet, stream_file, entity, get_image_state):
-        self.mirror_sprite_sheet = pygame.transform.flip(
-            self.get_sprite_sheet(sprite_sheet), True, False)
-
-        super(LeftRightGraphics, self).__init__(sprite_sheet, stream_file, entity, get_image_state)
-
+    """
+    LeftRightGraphics have a 'right_' and a 'left_' image set for each
+    animation in their stream file. The left animations are mirrored
+    from the right ones the first time their state is asked for, so
+    sprites only pay for the directions they actually face.
+    """
     def set_animation(self, name, stream):
         animation = stream.get_animation(
             name, self.sprite_sheet)
         self.image_sets["right_" + name] = animation
 
-        animation = stream.get_animation(
-            name, self.mirror_sprite_sheet,
-            mirror=True)
-        self.image_sets["left_" + name] = animation
+    def get_image_set(self):
+        state = self.get_image_state()
+        s = self.image_sets
+
+        if state not in s and state.startswith("left_"):
+            name = state[len("left_"):]
+            if name in self.stream.stream_dict:
+                s[state] = self.stream.get_animation(
+                    name, self.sprite_sheet, mirror=True)
+
+        return s.get(state)
 
 
 class Animation(ImageSet):
@@ -86,11 +91,42 @@ class Animation(ImageSet):
         self.animation_complete = False
 
         self._header = None
-        self.apply_stream(sprite_sheet, mirror=mirror)
+        self.apply_stream(sprite_sheet)
 
         if mirror:
+            self.mirror_images()
             self.reverse_hitboxes()
 
+    # the copy shares its frames, hitboxes and stream with this animation
+    # and only has its own playback state
+    def get_copy(self):
+        animation = copy(self)
+        animation.set_images(self.images)
+        animation.loops = 0
+        animation.animation_complete = False
+
+        return animation
+
+    # a copy of this animation facing the other way. Each distinct frame
+    # is flipped once and the sprite sheet itself is never flipped
+    def get_mirror(self):
+        animation = self.get_copy()
+        animation.mirror_images()
+        animation.reverse_hitboxes()
+
+        return animation
+
+    def mirror_images(self):
+        flipped = {}
+        images = []
+
+        for image in self.images:
+            if image not in flipped:
+                flipped[image] = pygame.transform.flip(image, True, False)
+            images.append(flipped[image])
+
+        self.set_images(images)
+
     def reverse_hitboxes(self):
         cw, ch = self.cell_size
         hitboxes = []
@@ -136,7 +172,7 @@ class Animation(ImageSet):
     def start_position(self):
         return self._header[2]
 
-    def apply_stream(self, sprite_sheet, mirror=False):
+    def apply_stream(self, sprite_sheet):
         stream = self._stream
         header = stream[0]  # ((cw, ch), fl, (sx, sy))
         self._header = header
@@ -145,14 +181,13 @@ class Animation(ImageSet):
         frame_length = header[1]
         start = header[2]
         self.make_images(sprite_sheet, cell_size,
-                         frame_length, start, mirror)
+                         frame_length, start)
 
     def make_images(self, sprite_sheet, cell_size, frame_length=1,
-                    start=(0, 0), mirror=False):
+                    start=(0, 0)):
         images = []
         w, h = cell_size
         sx, sy = start
-        cw, ch = sprite_sheet.get_size()
 
         for frame in self._stream[1:]:
             # print(frame)
@@ -160,10 +195,7 @@ class Animation(ImageSet):
             x *= w
             y *= h
 
-            px, py = x + (sx * w), y + (sy * h)
-            if mirror:
-                px = (cw - w) - px
-            position = px, py
+            position = x + (sx * w), y + (sy * h)
 
             r = pygame.Rect(position, cell_size)
             cell = sprite_sheet.subsurface(r)
@@ -173,6 +205,20 @@ class Animation(ImageSet):
 
 
 class StreamManager:
+    """
+    A StreamManager reads the animation streams and hitboxes for one
+    stream file and makes Animation objects from them. Stream files are
+    only parsed once, and the frames of each animation are only cut
+    from a given sprite sheet once: every StreamManager shares the
+    parsed files and a prototype Animation for each (sprite sheet,
+    stream file, animation, mirror), and hands out copies of it.
+    Mirrored prototypes are made from the unmirrored one. The shared
+    stream dicts and frames must not be edited.
+    """
+    STREAM_DICTS = {}       # stream file: stream dict
+    # (sheet content key, stream file, name, mirror): Animation
+    ANIMATIONS = {}
+
     class Section:
         def __init__(self, name, stream, hitboxes):
             self.name = name
@@ -180,19 +226,30 @@ class StreamManager:
             self.hitboxes = hitboxes
 
     def __init__(self, stream_file):
-        self.stream_dict = self.get_stream_dict(stream_file)
-
-    def get_animation(self, name, sprite_sheet, **kwargs):
-        section = self.stream_dict[name]
-        stream = section.stream
-        hitboxes = section.hitboxes
-
-        print(name)
-        animation = Animation(
-            name, sprite_sheet, stream,
-            hitboxes, **kwargs
-        )
-        return animation
+        self.stream_file = stream_file
+
+        stream_dicts = StreamManager.STREAM_DICTS
+        if stream_file not in stream_dicts:
+            stream_dicts[stream_file] = self.get_stream_dict(stream_file)
+        self.stream_dict = stream_dicts[stream_file]
+
+    def get_animation(self, name, sprite_sheet, mirror=False):
+        animations = StreamManager.ANIMATIONS
+        key = get_content_key(sprite_sheet), self.stream_file, name, mirror
+
+        if key not in animations:
+            if mirror:
+                animation = self.get_animation(name, sprite_sheet)
+                animations[key] = animation.get_mirror()
+
+            else:
+                section = self.stream_dict[name]
+                animations[key] = Animation(
+                    name, sprite_sheet, section.stream,
+                    section.hitboxes
+                )
+
+        return animations[key].get_copy()
 
     def get_stream_dict(self, stream_file):
         path = join(ANIMATION_STREAMS, stream_file)
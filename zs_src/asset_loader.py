@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+import pygame
+
+from zs_constants.zs import ASSET_LOADER_THREADS
+
+
+class AssetLoader:
+    """
+    An AssetLoader reads and decodes image files in a thread pool. Each
+    worker reads a file's bytes and decodes them with pygame.image.load()
+    from a file object, which lets SDL_image decode several files at
+    once on machines with more than one core.
+
+    load_images() blocks until every file is decoded, but results are
+    collected on the calling (main) thread, so the progress callback can
+    draw a loading screen and nothing outside the workers touches pygame
+    from another thread. The decoded surfaces are returned as they were
+    loaded: converting them to the display format and setting colorkeys
+    is left to the caller on the main thread.
+    """
+    def __init__(self, threads=ASSET_LOADER_THREADS):
+        self.threads = threads
+
+    @staticmethod
+    def read_image(path):
+        file = open(path, "rb")
+        data = file.read()
+        file.close()
+
+        return pygame.image.load(BytesIO(data), path)
+
+    # progress is called with (files loaded, total files)
+    def load_images(self, paths, progress=None):
+        paths = list(dict.fromkeys(paths))
+        images = {}
+
+        if self.threads < 2 or len(paths) < 2:
+            for path in paths:
+                images[path] = self.read_image(path)
+                if progress:
+                    progress(len(images), len(paths))
+
+            return images
+
+        with ThreadPoolExecutor(self.threads) as pool:
+            futures = {
+                pool.submit(self.read_image, path): path for path in paths
+            }
+
+            for future in as_completed(futures):
+                images[futures[future]] = future.result()
+                if progress:
+                    progress(len(images), len(paths))
+
+        return images
+
+
+def load_images(paths, progress=None):
+    return AssetLoader().load_images(paths, progress)
@@ -0,0 +1,183 @@
+from os import listdir
+from os.path import dirname, join
+from threading import Lock, current_thread, main_thread
+
+import pygame
+
+from zs_constants.paths import IMAGES
+from zs_constants.zs import TEXTURE_ATLAS
+from zs_src.asset_loader import load_images
+
+IMAGE_EXTENSIONS = ".gif", ".png", ".bmp"
+
+# sprite sheets and tilesets aren't packed. They're colorkeyed and get
+# an RLE accelerated colorkey from the image cache, which blits a whole
+# sheet about 12 times faster than a region of a per pixel alpha page
+ATLAS_FOLDERS = IMAGES,
+
+
+class TextureAtlas:
+    """
+    A TextureAtlas packs many small images into a few large 'page'
+    surfaces. Each packed image is then referenced by a region: a
+    subsurface of its page, so that the style images share a handful
+    of surfaces instead of each having its own.
+
+    Images are packed with a simple shelf algorithm: sorted from tallest
+    to shortest, placed left to right in rows ('shelves') the height of
+    the first image in the row, and a new page is started when a page is
+    full. Images larger than a page are not packed.
+
+    Pages have per pixel alpha so that images with different colorkeys
+    can share a page. Transparent pixels are blitted as transparent and
+    the regions don't need a colorkey.
+    """
+    PAGE_SIZE = 2048, 2048
+    PADDING = 1
+
+    def __init__(self, name, page_size=PAGE_SIZE, padding=PADDING):
+        self.name = name
+        self.page_size = page_size
+        self.padding = padding
+
+        self.pages = []
+        self.converted = False
+        self.regions = {}       # key: (page index, pygame.Rect)
+        self._shelves = []      # per page: list of [y, height, x]
+
+    def __repr__(self):
+        n, p, r = self.name, len(self.pages), len(self.regions)
+
+        return "TextureAtlas '{}' with {} pages, {} regions".format(n, p, r)
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def add_images(self, images):
+        keys = sorted(images, key=lambda k: -images[k].get_size()[1])
+
+        for key in keys:
+            self.add_image(key, images[key])
+
+    def add_image(self, key, image):
+        w, h = image.get_size()
+        pw, ph = self.page_size
+        pad = self.padding
+
+        if w + pad > pw or h + pad > ph:
+            return False
+
+        position = None
+        page = 0
+        for shelves in self._shelves:
+            position = self.place_on_page(shelves, w + pad, h + pad)
+            if position:
+                break
+            page += 1
+
+        if not position:
+            page = self.add_page()
+            position = self.place_on_page(self._shelves[page], w + pad, h + pad)
+
+        r = pygame.Rect(position, (w, h))
+        self.pages[page].blit(image, r.topleft)
+        self.regions[key] = page, r
+
+        return True
+
+    def place_on_page(self, shelves, w, h):
+        pw, ph = self.page_size
+
+        for shelf in shelves:
+            y, shelf_h, x = shelf
+            if h <= shelf_h and x + w <= pw:
+                shelf[2] += w
+                return x, y
+
+        if shelves:
+            y, shelf_h, x = shelves[-1]
+            top = y + shelf_h
+        else:
+            top = 0
+
+        if top + h <= ph and w <= pw:
+            shelves.append([top, h, w])
+            return 0, top
+
+    def add_page(self):
+        page = pygame.Surface(self.page_size, pygame.SRCALPHA, 32)
+        self.pages.append(page)
+        self._shelves.append([])
+
+        return len(self.pages) - 1
+
+    # pages are only converted on the main thread, once the display
+    # exists. An atlas built on a loader thread is converted the next
+    # time the main thread asks for it
+    def convert(self):
+        if current_thread() is not main_thread():
+            return
+
+        if pygame.display.get_surface() and not self.converted:
+            self.pages = [page.convert_alpha() for page in self.pages]
+            self.converted = True
+
+    def get_region(self, key):
+        page, r = self.regions[key]
+
+        return self.pages[page].subsurface(r)
+
+
+ATLASES = {}        # folder: TextureAtlas
+ATLAS_LOCK = Lock()
+
+
+# each folder's atlas is built the first time an image in it is asked
+# for. The files are decoded on the asset loader's threads and packed
+# here, on whichever thread asked first. The pages are converted by
+# get_atlas() or convert_atlas() on the main thread
+def build_atlas(folder):
+    paths = [join(folder, file_name) for file_name in listdir(folder)
+             if file_name.lower().endswith(IMAGE_EXTENSIONS)]
+    images = load_images(paths)
+
+    atlas = TextureAtlas(folder)
+    atlas.add_images(images)
+
+    return atlas
+
+
+# the environment loader thread can ask for an atlas while the main
+# thread does, so it's built under a lock
+def get_atlas(folder=IMAGES):
+    atlas = ATLASES.get(folder)
+
+    if not atlas:
+        with ATLAS_LOCK:
+            atlas = ATLASES.get(folder)
+            if not atlas:
+                atlas = build_atlas(folder)
+                ATLASES[folder] = atlas
+
+    atlas.convert()
+
+    return atlas
+
+
+# if an atlas is built before the display exists its pages are
+# converted later by resource_library.post_process_resources()
+def convert_atlas():
+    for atlas in list(ATLASES.values()):
+        atlas.convert()
+
+
+# returns None for images that aren't in an atlas so
+# that the caller can load them from disk as usual
+def get_atlas_image(path):
+    folder = dirname(path)
+    if not TEXTURE_ATLAS or folder not in ATLAS_FOLDERS:
+        return None
+
+    atlas = get_atlas(folder)
+    if path in atlas:
+        return atlas.get_region(path)
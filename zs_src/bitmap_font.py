@@ -0,0 +1,104 @@
+import pygame
+
+GLYPHS = "".join(chr(i) for i in range(32, 127))
+WHITE = 255, 255, 255
+
+
+class BitmapFont:
+    """
+    A BitmapFont pre-renders the printable ASCII glyphs of a
+    pygame.font.Font into one atlas surface and lays out strings by
+    blitting glyph sub rects from that surface with a single
+    Surface.blits() call, instead of calling Font.render() for every
+    string.
+
+    It has the same render(text, antialias, color) and size(text)
+    methods as a pygame Font, so TextGraphics and get_char_size() work
+    with either one. Glyphs are placed at their advance widths and
+    kerning is ignored, which is exact for monospaced fonts. Strings
+    with characters outside the atlas fall back to Font.render().
+
+    Glyphs are rendered in white and a tinted copy of the atlas is made
+    the first time each color is used.
+    """
+    def __init__(self, font, glyphs=GLYPHS):
+        self.font = font
+        self.glyphs = glyphs
+
+        self.height = font.get_height()
+        self.regions = self.get_regions()       # char: pygame.Rect
+        self._atlases = {}      # (color, antialias): surface
+
+        self._glyph_images = {
+            True: self.make_atlas(True),
+            False: self.make_atlas(False)
+        }
+
+    def __repr__(self):
+        return "BitmapFont with {} glyphs, height {}".format(
+            len(self.glyphs), self.height)
+
+    # glyphs are laid out in one row at their advance widths
+    def get_regions(self):
+        regions = {}
+
+        x = 0
+        for char in self.glyphs:
+            w = self.font.size(char)[0]
+            regions[char] = pygame.Rect(x, 0, w, self.height)
+            x += w
+
+        return regions
+
+    def make_atlas(self, antialias):
+        font, regions = self.font, self.regions
+        w = sum(r.width for r in regions.values())
+        atlas = pygame.Surface((w, self.height), pygame.SRCALPHA, 32)
+
+        for char in self.glyphs:
+            r = regions[char]
+            image = font.render(char, antialias, WHITE)
+            atlas.blit(image, r.topleft, area=((0, 0), r.size))
+
+        return atlas
+
+    def get_atlas(self, color, antialias):
+        key = tuple(color), bool(antialias)
+
+        if key not in self._atlases:
+            atlas = self._glyph_images[key[1]].copy()
+            atlas.fill(key[0], special_flags=pygame.BLEND_RGB_MULT)
+            self._atlases[key] = atlas
+
+        return self._atlases[key]
+
+    def can_render(self, text):
+        regions = self.regions
+
+        return all(c in regions for c in text)
+
+    def size(self, text):
+        if not self.can_render(text):
+            return self.font.size(text)
+
+        regions = self.regions
+
+        return sum(regions[c].width for c in text), self.height
+
+    def render(self, text, antialias, color):
+        if not self.can_render(text):
+            return self.font.render(text, antialias, color)
+
+        atlas = self.get_atlas(color, antialias)
+        regions = self.regions
+        image = pygame.Surface(self.size(text), pygame.SRCALPHA, 32)
+
+        blits = []
+        x = 0
+        for char in text:
+            r = regions[char]
+            blits.append((atlas, (x, 0), r))
+            x += r.width
+        image.blits(blits, False)
+
+        return image
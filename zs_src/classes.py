@@ -1,3 +1,6 @@
+from bisect import bisect_right
+from weakref import WeakKeyDictionary
+
 from zs_constants.zs import REPR_SIG_FIGS
 
 
@@ -519,3 +522,268 @@ class CollisionSystem:
     def group_collision_system(check, handle, group1, group2):
         for item in group1:
             CollisionSystem.item_group_collision_system(check, handle, item, group2)
+
+
+class RenderQueue:
+    """
+    A RenderQueue collects the items of every Group in a tree of Layers
+    and draws them in a single pass, ordered by a sort key. By default
+    items are sorted by the y value of their bottom edge so that sprites
+    lower on the screen are drawn over sprites behind them, which is what
+    top-down scenes need.
+
+    The queue is shared by every Layer in the tree (see
+    Layer.set_render_queue()). While a frame is drawn, each layer that
+    shares the queue submits the screen and offset its groups would have
+    been drawn with, and the 'root' Layer, the one the queue was assigned
+    to first, flushes the queue at the end of its own draw, once every
+    background has been drawn. Each item is drawn to the screen of the
+    layer it came from, so sub layer offsets and clipping still apply.
+
+    The sorted order is kept between frames and only items whose key has
+    changed (or that have been added to the tree) are re-inserted, so a
+    mostly static scene with hundreds of sprites costs one key call per
+    item per frame rather than a full sort.
+    """
+    def __init__(self, name, key=None):
+        self.name = name
+        self.root = None
+
+        if not key:
+            key = RenderQueue.get_depth
+        self.key = key
+
+        self._items = []        # items in draw order
+        self._sort_keys = []    # (key, order) tuples parallel to _items
+        self._keys = {}         # id(item) -> (key, order)
+        self._order = 0
+        self._targets = {}      # layer: (screen, offset), this frame
+
+    def __repr__(self):
+        return "RenderQueue '{}' with {} items".format(
+            self.name, len(self._items))
+
+    def __iter__(self):
+        return iter(self._items)
+
+    @staticmethod
+    def get_depth(item):
+        x, y = item.position
+        w, h = item.size
+
+        return y + h
+
+    def set_root(self, layer):
+        if not self.root:
+            self.root = layer
+
+    def clear(self):
+        self._items = []
+        self._sort_keys = []
+        self._keys = {}
+        self._targets = {}
+
+    # returns the items of the layers submitted this frame and the
+    # layer each one is drawn with. An item that's in more than one
+    # group is drawn with the first layer it was found in
+    def collect(self):
+        items = []
+        owners = {}     # id(item): layer
+
+        for layer in self._targets:
+            for group in layer.groups:
+                for item in group:
+                    if id(item) not in owners:
+                        owners[id(item)] = layer
+                        items.append(item)
+
+        return items, owners
+
+    def sort(self, items):
+        keys = self._keys
+        get_key = self.key
+
+        current = {}
+        changed = []
+        for item in items:
+            i = id(item)
+            if i in current:        # an item can be in more than one group
+                continue
+
+            key = get_key(item)
+            old = keys.get(i)
+            if old and old[0] == key:
+                current[i] = old
+            else:
+                if old:
+                    order = old[1]
+                else:
+                    order = self._order
+                    self._order += 1
+
+                current[i] = key, order
+                changed.append(item)
+
+        if not changed and len(current) == len(self._items):
+            return
+
+        # unchanged items keep the same (key, order) tuple object
+        # so an identity check filters out both removed items and
+        # items that will be re-inserted below
+        kept, kept_keys = [], []
+        for item, sort_key in zip(self._items, self._sort_keys):
+            i = id(item)
+            if i in current and current[i] is sort_key:
+                kept.append(item)
+                kept_keys.append(sort_key)
+
+        for item in changed:
+            sort_key = current[id(item)]
+            index = bisect_right(kept_keys, sort_key)
+            kept.insert(index, item)
+            kept_keys.insert(index, sort_key)
+
+        self._items = kept
+        self._sort_keys = kept_keys
+        self._keys = current
+
+    def submit(self, layer, screen, offset=(0, 0)):
+        self._targets[layer] = screen, offset
+
+    # consecutive items that are drawn to the same screen are drawn
+    # with one Surface.blits() call
+    def flush(self, layer):
+        targets = self._targets
+        if layer is not self.root or not targets:
+            return
+
+        items, owners = self.collect()
+        self.sort(items)
+
+        target, blits = None, []
+        for item in self._items:
+            if not item.visible:
+                continue
+
+            image = item.image
+            if image:
+                t = targets[owners[id(item)]]
+                if t is not target:
+                    if blits:
+                        target[0].blits(blits, False)
+                    target, blits = t, []
+
+                x, y = item.position
+                ox, oy = t[1]
+                blits.append((image, (x + ox, y + oy)))
+
+        if blits:
+            target[0].blits(blits, False)
+
+        self._targets = {}
+
+
+class LayoutQueue:
+    """
+    A LayoutQueue collects the objects whose layout is out of date so
+    that each one is laid out once per frame, right before it's drawn,
+    however many changes were made to it since the last frame. Objects
+    are added with add() and must have an update_layout() method.
+
+    Updating one object's layout can queue others (a container that
+    changes size queues the container it's in), so update_layouts()
+    runs until the queue is empty.
+
+    Objects are held weakly, so an object that is dropped while its
+    layout is queued isn't kept alive (or laid out) by the queue.
+    """
+    def __init__(self, name):
+        self.name = name
+        # dict keys are used as an ordered set
+        self._items = WeakKeyDictionary()
+
+    def __repr__(self):
+        return "LayoutQueue '{}' with {} items".format(
+            self.name, len(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def add(self, item):
+        self._items[item] = None
+
+    def discard(self, item):
+        self._items.pop(item, None)
+
+    def update_layouts(self):
+        items = self._items
+
+        while items:
+            item = next(iter(items))
+            del items[item]
+            item.update_layout()
+
+
+class Observable:
+    """
+    An Observable is a class attribute (a data descriptor) for fields
+    that other objects can watch without checking them every frame.
+    Assigning a value that isn't equal to the current one calls
+    mark_object_changed(obj) on each observer that was added to the
+    object with Observable.add_observer().
+
+    Only assignments are seen, so a field that is changed in place (like
+    a Vector) has to be passed to Observable.notify() by whatever
+    changes it, or be polled.
+    """
+    def __init__(self, default=None):
+        self.name = None
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        return obj.__dict__.get(self.name, self.default)
+
+    def __set__(self, obj, value):
+        d = obj.__dict__
+        old = d.get(self.name, self.default)
+        d[self.name] = value
+
+        if old is not value and old != value:
+            Observable.notify(obj)
+
+    @staticmethod
+    def is_field(obj, name):
+        return isinstance(getattr(type(obj), name, None), Observable)
+
+    # observers are kept on the object itself so that an object and the
+    # models watching it can be garbage collected together
+    @staticmethod
+    def add_observer(obj, observer):
+        observers = obj.__dict__.setdefault("_observers", [])
+
+        if observer not in observers:
+            observers.append(observer)
+
+    @staticmethod
+    def remove_observer(obj, observer):
+        observers = obj.__dict__.get("_observers")
+
+        if observers and observer in observers:
+            observers.remove(observer)
+
+    @staticmethod
+    def notify(obj):
+        observers = obj.__dict__.get("_observers")
+
+        if observers:
+            for observer in observers:
+                observer.mark_object_changed(obj)
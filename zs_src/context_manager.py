@@ -3,13 +3,19 @@ from copy import deepcopy
 from os.path import join
 from types import FunctionType, MethodType
 
-from zs_constants.paths import CONFIG
+from zs_constants.paths import CONFIG, ANIMATIONS, BG_LAYERS
 from zs_constants.sprite_demo import GRAVITY, COF
+from zs_src.asset_loader import load_images
+from zs_src.atlas import get_atlas_image
+from zs_src.classes import Observable, RenderQueue
 from zs_src.controller import Command, Step
 from zs_src.events import Event
+from zs_src.image_cache import get_image_cache
 from zs_src.layers.camera import CameraLayer, ParallaxBgLayer
 from zs_src.layers.physics import PhysicsLayer
 from zs_src.layers.regions import RegionLayer
+from zs_src.profiler import (
+    PROFILER, RECORDER, COLLISION_START, COLLISION_END)
 from zs_src.regions.platforms import TreePlat
 from zs_src.sprites.sprites import DemoSprite
 from zs_src.state_machines import SpriteDemoMachine
@@ -30,6 +36,7 @@ class ContextManager:
         self.camera_windows = None
         self.camera_dict = None
         self.groups_dict = {}
+        self.decoded_images = {}
 
         file = open(join(CONFIG, env.file_name + ".cfg"), "r")
         lines = [line for line in file if line != "\n"]
@@ -196,6 +203,7 @@ class ContextManager:
     def handle_collisions(self):
         d = self.collision_systems
         get_group = self.environment.get_group
+        RECORDER.mark(COLLISION_START)
 
         for name in d:
             system = d[name]
@@ -203,7 +211,9 @@ class ContextManager:
                 get_group(n) for n in system["args"]
             ])
 
-            COLLISIONS_DICT[name](*args)
+            PROFILER.call(("collisions", name), COLLISIONS_DICT[name], *args)
+
+        RECORDER.mark(COLLISION_END)
 
     def set_up_camera(self):
         env = self.environment
@@ -276,6 +286,15 @@ class ContextManager:
 
                     layer.add_hud_box(value_name, obj, fields)
 
+    def set_up_render_queues(self):
+        for name in self.layers_dict:
+            ld = self.layers_dict[name]
+
+            if ld.get("render_queue"):
+                layer = ld["layer"]
+                layer.set_render_queue(
+                    RenderQueue(name + " render queue"))
+
     def set_up_commands(self):
         for c in self.environment.controllers:
             commands = self.command_dict
@@ -290,6 +309,7 @@ class ContextManager:
                 env.set_value(
                     "_" + item.name, item.interface
                 )
+                self.link_interface_fields(item)
 
             for value_name in item.interface:
                 value = item.interface[value_name]
@@ -300,6 +320,23 @@ class ContextManager:
                     model.link_sub_value("_" + item.name, value_name,
                                          set_method)
 
+    # interface values that are Observable fields of the item are kept
+    # up to date in the model when the item changes them itself
+    def link_interface_fields(self, item):
+        fields = [name for name in item.interface
+                  if Observable.is_field(item, name)]
+
+        if fields:
+            def get_interface(obj):
+                interface = dict(obj.interface)
+                for name in fields:
+                    interface[name] = getattr(obj, name)
+
+                return interface
+
+            self.environment.model.link_object(
+                item, "_" + item.name, get_interface)
+
     def reset_controllers(self):
         gd = self.groups_dict
 
@@ -309,6 +346,42 @@ class ContextManager:
                 if hasattr(sprite, "controller"):
                     self.set_item_controller(sprite)
 
+    # the sprite sheets and bg layer images named in the context file,
+    # all of which are loaded with a colorkey
+    def get_image_paths(self):
+        paths = []
+
+        if self.bg_layers_dict:
+            for name in self.bg_layers_dict:
+                image = self.bg_layers_dict[name]["image"]
+                paths.append(join(BG_LAYERS, image))
+
+        if self.items_dict:
+            for name in self.items_dict:
+                d = self.items_dict[name]
+                if d.get("animation"):
+                    sheet = d.get("sprite_sheet", d["animation"])
+                    paths.append(join(ANIMATIONS, sheet + GFX))
+
+        return paths
+
+    # decodes the images that aren't loaded yet without adding them to
+    # the image cache, so it can be called from a background thread
+    def decode_assets(self):
+        cache = get_image_cache()
+        paths = [
+            p for p in self.get_image_paths() if get_atlas_image(p) is None
+            and cache.get_key(p, True) not in cache
+        ]
+
+        self.decoded_images = load_images(paths)
+
+    def preload_assets(self, progress=None):
+        get_image_cache().preload(
+            self.get_image_paths(), colorkey=True, progress=progress,
+            images=self.decoded_images)
+        self.decoded_images = {}
+
     def load_layer(self, name):
         env = self.environment
         ld = self.layers_dict[name]
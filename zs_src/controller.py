@@ -257,6 +257,9 @@ class InputManager:
         self.controller_profiles = OrderedDict()
         self.load_profiles(profile_names)
 
+        # name: [key mapping, function, pressed last frame]
+        self.hotkeys = OrderedDict()
+
     @property
     def profile_names(self):
         return list(self.controller_profiles.keys())
@@ -289,6 +292,26 @@ class InputManager:
 
             self.controller_profiles[name] = profile
 
+    # hotkeys are keyboard keys that call a function when they're
+    # pressed, outside of any controller profile. key is a key name
+    # like 'f9'
+    def add_hotkey(self, name, key, function):
+        mapping = InputMapper.ButtonMappingKey(
+            InputMapper.ButtonMappingKey.get_id(key))
+        self.hotkeys[name] = [mapping, function, False]
+
+    def remove_hotkey(self, name):
+        self.hotkeys.pop(name, None)
+
+    def update_hotkeys(self):
+        for hotkey in self.hotkeys.values():
+            mapping, function, held = hotkey
+            pressed = bool(mapping.is_pressed())
+            hotkey[2] = pressed
+
+            if pressed and not held:
+                function()
+
 
 class InputDevice:
     def __init__(self, name, controller):
@@ -1,19 +1,49 @@
+from contextlib import contextmanager
 from sys import exit
 from types import MethodType
 
 from zs_constants.zs import SCREEN_SIZE, TRANSITION_TIME
-from zs_src.classes import CollisionSystem
+from zs_src.classes import CollisionSystem, LayoutQueue, Observable
 from zs_src.events import EventInterface
 from zs_src.geometry import Wall, Rect
+from zs_src.profiler import (
+    PROFILER, RECORDER, INPUT_END, UPDATE_END, DRAW_END)
+
+LAYOUT_QUEUE = LayoutQueue("layouts")
+
+
+def get_layout_queue():
+    return LAYOUT_QUEUE
 
 
 class Model(EventInterface):
+    """
+    A Model holds a layer's named values and calls the functions linked
+    to a value whenever it changes.
+
+    link_object() keeps a value equal to function(obj). By default the
+    function is only called again after the object reports a change
+    through its Observable fields (or Observable.notify()), so the
+    function must only depend on those. Linking with poll=True calls the
+    function on every update instead, for functions that read anything
+    else. Changes are picked up on the model's next update, so the cost
+    of an update grows with the number of changed objects rather than
+    the number of linked ones.
+
+    Inside a batch() the linked functions aren't called as values
+    change. When the outermost batch ends, the functions of each value
+    that changed are called once, with its final value.
+    """
     def __init__(self, name, v_dict):
         self.name = name
         super(Model, self).__init__(name)
         self.values = {}
         self.change_functions = {}
-        self.object_listeners = []
+        self.object_listeners = []      # polled every update
+        self.pushed_listeners = {}      # obj: [listeners]
+        self.changed_objects = {}       # dict keys are used as an ordered set
+        self.batch_depth = 0
+        self.pending_changes = {}       # value names, as an ordered set
 
         if v_dict:
             self.set_values(v_dict)
@@ -41,7 +71,15 @@ class Model(EventInterface):
 
     def set_values(self, v_dict):
         for name in v_dict:
-            self.values[name] = v_dict[name]
+            self.write_value(name, v_dict[name])
+
+    # value_names only changes when a name is added, so that is when the
+    # model tells itself to check it again
+    def write_value(self, name, value):
+        if name not in self.values:
+            Observable.notify(self)
+
+        self.values[name] = value
 
     def link_value(self, value_name, function):
         functions = self.change_functions.get(value_name, [])
@@ -60,12 +98,45 @@ class Model(EventInterface):
         functions.append(sub_function)
         self.change_functions[value_name] = functions
 
-    def link_object(self, obj, value_name, function):
+    def link_object(self, obj, value_name, function, poll=False):
         l = (obj, value_name, function)
-        self.object_listeners.append(l)
-        self.check_object_listeners()
+
+        if poll:
+            self.object_listeners.append(l)
+        else:
+            self.pushed_listeners.setdefault(obj, []).append(l)
+            Observable.add_observer(obj, self)
+
+        self.check_object_listener(l)
+
+    def mark_object_changed(self, obj):
+        self.changed_objects[obj] = None
+
+    # the changes are handled even if the batch raises, since the
+    # values were already set
+    @contextmanager
+    def batch(self):
+        self.batch_depth += 1
+
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth:
+                self.commit()
+
+    def commit(self):
+        pending = self.pending_changes
+
+        while pending:
+            value_name = next(iter(pending))
+            del pending[value_name]
+            self.handle_change(value_name)
 
     def handle_change(self, value_name):
+        if self.batch_depth:
+            self.pending_changes[value_name] = None
+            return
 
         if value_name in self.change_functions:
             value = self.values.get(value_name)
@@ -73,14 +144,14 @@ class Model(EventInterface):
                 func(value)
 
     def set_value(self, value_name, value):
-        self.values[value_name] = value
+        self.write_value(value_name, value)
         self.handle_change(value_name)
 
     def on_change_value(self):
         name = self.event.value_name
         value = self.event.get_value(self.event)
 
-        self.values[name] = value
+        self.write_value(name, value)
         self.handle_change(name)
 
     def on_append_value(self):
@@ -119,36 +190,57 @@ class Model(EventInterface):
     def on_set_value_to(self):
         name = self.event.value_name
         value = self.event.value
-        self.values[name] = value
+        self.write_value(name, value)
 
+        # an ignored value isn't queued in a batch either, but a change
+        # queued earlier in the batch is still handled with this value
         if not self.event.get("ignore", False):
             self.handle_change(name)
 
+    # the changes made by the model's events and linked objects in one
+    # update are handled together at the end of it
     def update(self):
-        self.event_handler.update()
+        with self.batch():
+            self.event_handler.update()
 
-        self.check_object_listeners()
+            self.check_linked_objects()
 
     def clear_object_link(self, obj):
-        remove = []
-
-        for l in self.object_listeners:
-            o, value_name, func = l
-            if o is obj:
-                remove.append(l)
-
         self.object_listeners = [
-            l for l in self.object_listeners if l not in remove
+            l for l in self.object_listeners if l[0] is not obj
         ]
 
+        if obj in self.pushed_listeners:
+            del self.pushed_listeners[obj]
+            self.changed_objects.pop(obj, None)
+            Observable.remove_observer(obj, self)
+
+    # polled listeners are checked every time, other listeners only
+    # when their object has changed since the last check
     def check_object_listeners(self):
+        with self.batch():
+            self.check_linked_objects()
+
+    def check_linked_objects(self):
         for l in self.object_listeners:
-            obj, value_name, func = l
-            current = self.values.get(value_name)
-            value = func(obj)
+            self.check_object_listener(l)
 
-            if not current == value:
-                self.set_value(value_name, value)
+        changed = self.changed_objects
+        pushed = self.pushed_listeners
+        while changed:
+            obj = next(iter(changed))
+            del changed[obj]
+
+            for l in pushed.get(obj, ()):
+                self.check_object_listener(l)
+
+    def check_object_listener(self, l):
+        obj, value_name, func = l
+        current = self.values.get(value_name)
+        value = func(obj)
+
+        if not current == value:
+            self.set_value(value_name, value)
 
 
 class Entity(EventInterface):
@@ -167,6 +259,11 @@ class Entity(EventInterface):
                    "die", "dying", "death",
                    "change_state", "change_linked_value")
     STATES = "spawning", "alive", "dying", "dead"
+    # fields that models can link to without polling. Position and size
+    # changes are reported by adjust_position() and adjust_size()
+    active = Observable()
+    visible = Observable()
+    spawn_state = Observable()
 
     def __init__(self, name, size=(1, 1), position=(0, 0)):
         self.name = name
@@ -260,10 +357,12 @@ class Entity(EventInterface):
     #   that behavior
     def adjust_size(self, value):
         self.rect.size = value
+        Observable.notify(self)
 
     def adjust_position(self, value):
         # self.rect.topleft = value
         self.rect.position = value
+        Observable.notify(self)
 
     def move(self, value):
         dx, dy = value
@@ -276,8 +375,19 @@ class Entity(EventInterface):
         if self.graphics:
             self.graphics.update()
 
-        for method in self.get_update_methods():
-            method()
+        if PROFILER.enabled:
+            name = self.get_profile_name()
+            for method in self.get_update_methods():
+                PROFILER.call((name, method.__qualname__), method)
+
+        else:
+            for method in self.get_update_methods():
+                method()
+
+    # the owner name that this entity's update methods are timed under
+    # by the frame profiler
+    def get_profile_name(self):
+        return self.__class__.__name__
 
     # ALL subclasses that overwrite this method
     # should ALWAYS call the super() version and
@@ -347,6 +457,9 @@ class Layer(Entity):
     method also calls the get_input() method which can reference any
     of the Controller objects in the 'controllers' list.
     """
+    # 'paused' is worked out from the pause_layer
+    pause_layer = Observable()
+
     class Group:
         def __init__(self):
             self._items = []
@@ -381,6 +494,7 @@ class Layer(Entity):
         super(Layer, self).__init__(name, size, position)
 
         self.transition_to = None
+        self.preload_to = None
         self.return_to = None
         self.pause_layer = None
 
@@ -389,6 +503,7 @@ class Layer(Entity):
         self.controllers = []
         self.groups = []
         self.sub_layers = []
+        self.render_queue = None
 
         self.model = Model(self.name + " model", model)
         self.add_event_methods("change_environment", "pause", "unpause")
@@ -399,6 +514,13 @@ class Layer(Entity):
     def populate(self):
         pass
 
+    # the prepare method is meant to be overwritten by subclasses that
+    # do slow loading work when they spawn. The Game may call it on a
+    # background thread before the layer is spawned, so it must not
+    # touch the display or any other entity.
+    def prepare(self):
+        pass
+
     @property
     def paused(self):
         return bool(self.pause_layer)
@@ -437,13 +559,30 @@ class Layer(Entity):
     def add_sub_layer(self, layer):
         self.sub_layers.append(layer)
 
+    # the render_queue is shared with every current sub_layer so that
+    # the items of all their groups are sorted and drawn together when
+    # the layer the queue was first assigned to finishes drawing. Sub
+    # layers added afterwards (such as a pause_layer) keep drawing
+    # their own groups, and sub layers without groups (like debug
+    # overlays) don't share the queue so that they're drawn on top
+    def set_render_queue(self, queue):
+        self.render_queue = queue
+        if queue:
+            queue.set_root(self)
+
+        for layer in self.sub_layers:
+            if layer.groups or layer.sub_layers:
+                layer.set_render_queue(queue)
+
     def handle_controller(self):
         for c in self.controllers:
             c.update()
 
         for layer in self.sub_layers:
             if layer.active:
-                layer.handle_controller()
+                PROFILER.call(
+                    (layer.name, "handle_controller"),
+                    layer.handle_controller)
 
     def get_update_methods(self):
         um = super(Layer, self).get_update_methods()
@@ -452,6 +591,9 @@ class Layer(Entity):
                      self.update_sub_layers,
                      self.model.update]
 
+    def get_profile_name(self):
+        return self.name
+
     def update_groups(self):
         for group in self.groups:
             group.update()
@@ -463,8 +605,11 @@ class Layer(Entity):
 
     # the Layer object's rect attribute determines the region where the
     # layer will be drawn to the screen. Then all sub_layers are drawn
-    # to this region recursively.
+    # to this region recursively. Layouts that changed since the last
+    # frame are updated first
     def draw(self, screen, offset=(0, 0)):
+        LAYOUT_QUEUE.update_layouts()
+
         sub_rect = self.rect.clip(
             screen.get_rect())
 
@@ -477,29 +622,60 @@ class Layer(Entity):
             self.graphics.draw(
                 screen, offset=offset)
 
-        if self.groups:
-            for g in self.groups:
-                g.draw(sub_screen, offset=offset)
+        self.draw_groups(sub_screen, offset=offset)
 
         if self.sub_layers:
+            queue = self.render_queue
+
             for layer in self.sub_layers:
                 if layer.visible:
-                    layer.draw(
-                        sub_screen, offset=offset)
+                    # queued items go under sub layers that don't
+                    # share the queue
+                    if queue and layer.render_queue is not queue:
+                        self.flush_render_queue()
+
+                    PROFILER.call(
+                        (layer.name, "draw"), layer.draw,
+                        sub_screen, offset)
+
+        self.flush_render_queue()
 
         return sub_screen
 
+    # layers that share a render_queue submit their screen to it and
+    # their items are drawn by flush_render_queue()
+    def draw_groups(self, screen, offset=(0, 0)):
+        if self.render_queue:
+            self.render_queue.submit(
+                self, screen, offset=offset)
+
+        else:
+            for g in self.groups:
+                g.draw(screen, offset=offset)
+
+    # only does something for the root layer of the queue. Subclasses
+    # that override draw() call this at the end of their draw()
+    def flush_render_queue(self):
+        if self.render_queue:
+            self.render_queue.flush(self)
+
     # the main() method is called by the Game object's main() method
     # each iteration of the loop (i.e. once per frame) if it is assigned
     # to the game's "environment" attribute.
     def main(self, screen):
-        self.handle_controller()
+        PROFILER.call(
+            (self.name, "handle_controller"), self.handle_controller)
+        RECORDER.mark(INPUT_END)
         self.update()
-        self.draw(screen)
+        RECORDER.mark(UPDATE_END)
+        PROFILER.call((self.name, "draw"), self.draw, screen)
+        RECORDER.mark(DRAW_END)
 
     def on_change_environment(self):
         env = self.event.environment
         env.return_to = self
+        # the next environment loads while this one is dying
+        self.preload_to = env
 
         transition = ("die",
                       ("goto", env))
@@ -1,10 +1,65 @@
+from os import environ
 from sys import exit
+from threading import Event, Thread
+from time import perf_counter
 
 import pygame
 
+from zs_constants.zs import PROFILE_CAPTURE_KEY
+from zs_src.profiler import (
+    PROFILER, RECORD_FRAMES_VARIABLE, FRAME_START, get_frame_recorder,
+    get_profile_capture)
+from zs_src.resource_library import post_process_resources
+
+
+class EnvironmentLoader:
+    """
+    An EnvironmentLoader calls an environment's prepare() method on a
+    background thread, so that the work of loading it (parsing context
+    files, decoding images) can overlap the frames before the Game
+    transitions to it.
+
+    prepare() must not touch the display or any entity that's being
+    updated on the main thread. Spawning the environment still happens
+    on the main thread, and uses whatever prepare() left behind. If
+    prepare() raised an exception it's kept in 'error' and the
+    environment is loaded synchronously when it's spawned.
+    """
+    def __init__(self, environment):
+        self.environment = environment
+        self.error = None
+        self.load_time = 0
+
+        self._done = Event()
+        self._thread = Thread(
+            target=self.load, name="loader " + environment.name,
+            daemon=True)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def wait(self):
+        self._done.wait()
+
+    def load(self):
+        start = perf_counter()
+        try:
+            self.environment.prepare()
+        except Exception as e:
+            self.error = e
+        self.load_time = perf_counter() - start
+
+        self._done.set()
+
 
 class Game:
     def __init__(self, start_env, screen, input_manager, frame_rate):
+        post_process_resources()
+
         self.environment = start_env()
         self.environment.game_environment = True
         self.screen = screen
@@ -14,6 +69,21 @@ class Game:
         self.controllers = input_manager.get_controllers()
         self.environment.controllers = input_manager.get_controllers()
 
+        # environment: EnvironmentLoader
+        self.loaders = {}
+        # (environment name, seconds spent spawning, preloaded)
+        self.transition_times = []
+
+        # the frame recorder can be turned on at launch by setting
+        # the ZS_RECORD_FRAMES environment variable
+        self.recorder = get_frame_recorder()
+        if environ.get(RECORD_FRAMES_VARIABLE):
+            self.recorder.set_enabled(True)
+
+        # profile captures of the next few frames are started from the
+        # pause menu or with the profile capture hotkey
+        self.capture = get_profile_capture()
+
     @staticmethod
     def poll_events():
         for event in pygame.event.get():
@@ -22,20 +92,43 @@ class Game:
 
     def main(self):
         self.environment.handle_event("spawn")
+        self.input_manager.add_hotkey(
+            "profile capture", PROFILE_CAPTURE_KEY, self.capture.start)
 
+        # the frame starts after the wait on the clock, so that event
+        # polling and the controller update are part of its input phase
         clock = pygame.time.Clock()
         while True:
+            dt = clock.tick(self.frame_rate) / 1000
+            self.recorder.mark(FRAME_START)
+
             self.poll_events()
+            self.input_manager.update_hotkeys()
             self.controllers[0].update()
-            self.main_routine(clock)
-            pygame.display.flip()
+            self.present_frame(dt)
 
-    def main_routine(self, clock=None):
-        if clock:
-            dt = clock.tick(self.frame_rate) / 1000
-            # print(dt)
-        else:
-            dt = 1
+    # the frame recorder's flip mark is taken after the flip returns.
+    # A running profile capture profiles main_routine
+    def present_frame(self, dt=1):
+        self.capture.call(self.main_routine, dt)
+        pygame.display.flip()
+
+        self.recorder.end_frame()
+
+    # starts preparing an environment in the background. The Game will
+    # wait for it to finish before transitioning to it
+    def preload_environment(self, environment):
+        if environment not in self.loaders:
+            loader = EnvironmentLoader(environment)
+            self.loaders[environment] = loader
+            loader.start()
+
+        return self.loaders[environment]
+
+    # the frame profiler's frame ends here. dt is the time since the
+    # last frame, in seconds
+    def main_routine(self, dt=1):
+        start = perf_counter()
 
         environment = self.environment
 
@@ -43,15 +136,43 @@ class Game:
         environment.set_value("_dt", dt)
         environment.main(self.screen)
 
+        p = environment.preload_to
+        if p:
+            environment.preload_to = None
+            self.preload_environment(p)
+
         t = environment.transition_to
         if t:
-            environment.transition_to = None
-            environment.game_environment = False
-            return_value = environment.get_value("_return")
-            print(return_value)
-
-            t.controllers = self.input_manager.get_controllers()
-            t.set_value("_return", return_value)
-            t.handle_event("spawn")
-            t.game_environment = True
-            self.environment = t
+            self.change_environment(t)
+
+        if PROFILER.enabled:
+            PROFILER.add_time(
+                ("Game", "main_routine"), perf_counter() - start)
+            PROFILER.end_frame()
+
+    # the swap happens on the first frame that the target environment's
+    # loader is done, and environments that weren't preloaded are
+    # loaded synchronously
+    def change_environment(self, t):
+        loader = self.loaders.get(t)
+        if loader and not loader.done:
+            return
+
+        self.loaders.pop(t, None)
+        environment = self.environment
+        environment.transition_to = None
+        environment.game_environment = False
+        return_value = environment.get_value("_return")
+        print(return_value)
+
+        t.controllers = self.input_manager.get_controllers()
+        t.set_value("_return", return_value)
+
+        start = perf_counter()
+        t.handle_event("spawn")
+        preloaded = bool(loader and not loader.error)
+        self.transition_times.append(
+            (t.name, perf_counter() - start, preloaded))
+
+        t.game_environment = True
+        self.environment = t
@@ -3,8 +3,9 @@ from os.path import join
 import pygame
 
 from zs_constants.style import BG_STYLES, BORDER_CORNER_CHOICES, BG, ALPHA
-from zs_constants.zs import TEXT_ANTI_ALIAS, SCREEN_SIZE
+from zs_constants.zs import TEXT_ANTI_ALIAS, SCREEN_SIZE, TEXT_CACHE_BUDGET, CONTAINER_CACHE_BUDGET, PRE_RENDER_BUDGET
 from zs_src.classes import Meter
+from zs_src.image_cache import load_image, SurfaceCache, get_content_key
 from zs_src.style import Style
 
 
@@ -99,11 +100,7 @@ class Graphics:
 
     @staticmethod
     def load_image(folder, image_name):
-        path = join(folder, image_name)
-        image = pygame.image.load(path)
-        image.set_colorkey(image.get_at((0, 0)))
-
-        return image
+        return load_image(join(folder, image_name), colorkey=True)
 
 
 class IconGraphics(Graphics):
@@ -116,7 +113,10 @@ class IconGraphics(Graphics):
 
 
 class BgGraphics(Graphics):
-    PRE_RENDERS = {}
+    # pre rendered surfaces are keyed by the content of the image they
+    # were made from. A tiled background is twice the screen size, so
+    # the cache has a byte budget instead of growing with every style
+    PRE_RENDERS = SurfaceCache("bg pre renders", PRE_RENDER_BUDGET)
 
     def __init__(self, entity):
         super(BgGraphics, self).__init__(entity)
@@ -132,17 +132,8 @@ class BgGraphics(Graphics):
 
         s = self.entity.style
         size = self.entity.size
-
-        if hasattr(self.entity, "bg_color"):
-            bg_color = self.entity.bg_color
-        else:
-            bg_color = s.colors["bg"]
-
-        if s.images["bg"]:
-            bg_image = s.get_image(BG)
-        else:
-            bg_image = None
-
+        bg_color = self.get_bg_color()
+        bg_image = self.get_style_bg_image()
         bg_style = s.bg_style
 
         surface = cg(size, bg_color)
@@ -153,6 +144,20 @@ class BgGraphics(Graphics):
 
         return image
 
+    def get_bg_color(self):
+        if hasattr(self.entity, "bg_color"):
+            return self.entity.bg_color
+        else:
+            return self.entity.style.colors["bg"]
+
+    def get_style_bg_image(self):
+        s = self.entity.style
+
+        if s.images["bg"]:
+            return s.get_image(BG)
+        else:
+            return None
+
     @staticmethod
     def make_color_image(size, color):
         s = pygame.Surface(size).convert()
@@ -177,8 +182,10 @@ class BgGraphics(Graphics):
 
     @staticmethod
     def tile(bg_image, surface):
-        bg_hash = hash(bg_image)
-        if bg_hash not in BgGraphics.PRE_RENDERS:
+        key = "tile", get_content_key(bg_image)
+        full_bg = BgGraphics.PRE_RENDERS.get(key)
+
+        if full_bg is None:
             sx, sy = SCREEN_SIZE
             sx *= 2
             sy *= 2
@@ -192,9 +199,8 @@ class BgGraphics(Graphics):
                 for y in range(0, h + img_h, img_h):
                     pr_surface.blit(bg_image, (x, y))
 
-            BgGraphics.PRE_RENDERS[bg_hash] = pr_surface
-
-        full_bg = BgGraphics.PRE_RENDERS[bg_hash]
+            BgGraphics.PRE_RENDERS.add(key, pr_surface)
+            full_bg = pr_surface
 
         r = surface.get_rect().clip(full_bg.get_rect())
         blit_region = full_bg.subsurface(r)
@@ -218,16 +224,90 @@ class BgGraphics(Graphics):
 
 
 class ContainerGraphics(BgGraphics):
-    PRE_RENDERS = {}
+    PRE_RENDERS = SurfaceCache("border pre renders", PRE_RENDER_BUDGET)
+    # finished container images are shared by every container with the
+    # same size and style, so menus that are opened and closed again
+    # don't have to composite their borders again
+    IMAGE_CACHE = SurfaceCache("container images", CONTAINER_CACHE_BUDGET)
 
     def __init__(self, entity):
+        self.fade = None    # (container image, faded copy)
         super(ContainerGraphics, self).__init__(entity)
         self.set_default_image(self.get_container_image())
 
     def reset_image(self):
         self.set_default_image(self.get_container_image())
 
+    def get_image(self):
+        image = super(ContainerGraphics, self).get_image()
+        fade = self.fade
+
+        if fade is None:
+            return image
+
+        if fade[0] is not image:
+            self.fade = image, self.get_fade_image(image, fade[1].get_alpha())
+
+        return self.fade[1]
+
+    # spawn and death fades draw a copy of the container image with a
+    # surface alpha, since the cached image is shared. A ratio of None
+    # or 1 ends the fade
+    def set_fade(self, ratio):
+        if ratio is None or ratio >= 1:
+            self.fade = None
+            return
+
+        alpha = round(255 * max(ratio, 0))
+        image = super(ContainerGraphics, self).get_image()
+        fade = self.fade
+
+        if fade is None or fade[0] is not image:
+            self.fade = image, self.get_fade_image(image, alpha)
+        else:
+            fade[1].set_alpha(alpha)
+
+    @staticmethod
+    def get_fade_image(image, alpha):
+        fade_image = image.copy()
+        fade_image.set_alpha(alpha)
+
+        return fade_image
+
+    @staticmethod
+    def get_color_key(color):
+        if color:
+            return tuple(color)
+        else:
+            return color
+
+    # a key for everything that the container image depends on. Images
+    # are hashed by identity
+    def get_image_key(self):
+        s = self.entity.style
+        ck = self.get_color_key
+        sides, corners = s.border_style
+
+        if ALPHA in s.colors:
+            alpha = ck(s.colors[ALPHA])
+        else:
+            alpha = None
+
+        return (tuple(self.entity.size),
+                ck(self.get_bg_color()), self.get_style_bg_image(),
+                s.bg_style, s.border_images, sides, corners, alpha)
+
     def get_container_image(self):
+        key = self.get_image_key()
+        image = ContainerGraphics.IMAGE_CACHE.get(key)
+
+        if image is None:
+            image = self.make_container_image()
+            ContainerGraphics.IMAGE_CACHE.add(key, image)
+
+        return image
+
+    def make_container_image(self):
         entity = self.entity
         s = entity.style
 
@@ -271,16 +351,16 @@ class ContainerGraphics(BgGraphics):
 
         if "r" in sides:
             h_offset = w - full_h_side.get_size()[0]
-            surface.blit(pygame.transform.flip(
-                full_h_side, True, False), (h_offset, 0))
+            surface.blit(contg.get_flipped_side(
+                h_side_image, "h"), (h_offset, 0))
 
         if "t" in sides:
             surface.blit(full_v_side, (0, 0))
 
         if "b" in sides:
             v_offset = h - full_v_side.get_size()[1]
-            surface.blit(pygame.transform.flip(
-                full_v_side, False, True), (0, v_offset))
+            surface.blit(contg.get_flipped_side(
+                v_side_image, "v"), (0, v_offset))
 
         if corners:
             blit_corners(corner_image, surface, corners)
@@ -297,8 +377,10 @@ class ContainerGraphics(BgGraphics):
 
     @staticmethod
     def get_full_side_image(image, orientation):
-        i_hash = hash(image)
-        if i_hash not in ContainerGraphics.PRE_RENDERS:
+        key = get_content_key(image), orientation
+        pr_surface = ContainerGraphics.PRE_RENDERS.get(key)
+
+        if pr_surface is None:
             iw, ih = image.get_size()
             h, v = "hv"
             size = {h: (iw, SCREEN_SIZE[1]),
@@ -314,9 +396,28 @@ class ContainerGraphics(BgGraphics):
                             v: (i, 0)}[orientation]
                 pr_surface.blit(image, position)
 
-            ContainerGraphics.PRE_RENDERS[i_hash] = pr_surface
+            ContainerGraphics.PRE_RENDERS.add(key, pr_surface)
+
+        return pr_surface
+
+    # the right and bottom sides are the left and top side strips
+    # mirrored, so they're flipped once and kept with the pre renders
+    @staticmethod
+    def get_flipped_side(image, orientation):
+        key = get_content_key(image), orientation, "flipped"
+        flipped = ContainerGraphics.PRE_RENDERS.get(key)
+
+        if flipped is None:
+            h, v = "hv"
+            xy = {h: (True, False),
+                  v: (False, True)}[orientation]
+
+            full_side = ContainerGraphics.get_full_side_image(
+                image, orientation)
+            flipped = pygame.transform.flip(full_side, *xy)
+            ContainerGraphics.PRE_RENDERS.add(key, flipped)
 
-        return ContainerGraphics.PRE_RENDERS[i_hash]
+        return flipped
 
     @staticmethod
     def blit_corners(corner_image, surface, corners):
@@ -333,17 +434,30 @@ class ContainerGraphics(BgGraphics):
 
     @staticmethod
     def get_corner(img, string):
-        a, b, c, d = BORDER_CORNER_CHOICES
-        flip = pygame.transform.flip
-        corner = {a: lambda i: i,
-                  b: lambda i: flip(i, True, False),
-                  c: lambda i: flip(i, False, True),
-                  d: lambda i: flip(i, True, True)}[string](img)
+        key = get_content_key(img), string
+        corner = ContainerGraphics.PRE_RENDERS.get(key)
+
+        if corner is None:
+            a, b, c, d = BORDER_CORNER_CHOICES
+            flip = pygame.transform.flip
+            corner = {a: lambda i: i,
+                      b: lambda i: flip(i, True, False),
+                      c: lambda i: flip(i, False, True),
+                      d: lambda i: flip(i, True, True)}[string](img)
+
+            ContainerGraphics.PRE_RENDERS.add(key, corner)
 
         return corner
 
 
 class TextGraphics(Graphics):
+    # rendered lines are cached by (line, font, color, antialias) and
+    # whole text images by the text and the layout parameters, so that
+    # HUD values that repeat or flicker between a few states don't have
+    # to be rendered again
+    LINE_CACHE = SurfaceCache("text lines", TEXT_CACHE_BUDGET)
+    BLOCK_CACHE = SurfaceCache("text blocks", TEXT_CACHE_BUDGET)
+
     def reset_image(self):
         self.set_default_image(self.get_text_image())
 
@@ -365,6 +479,8 @@ class TextGraphics(Graphics):
     def get_text(text, cutoff, nl):
         if type(text) == str:
             text = [text]
+        else:
+            text = list(text)
 
         for i in range(len(text)):
             line = text[i]
@@ -390,13 +506,39 @@ class TextGraphics(Graphics):
 
         return new_text
 
+    @staticmethod
+    def render_line(line, font, color):
+        key = line, font, color, TEXT_ANTI_ALIAS
+        image = TextGraphics.LINE_CACHE.get(key)
+
+        if image is None:
+            image = font.render(line, TEXT_ANTI_ALIAS, color)
+            TextGraphics.LINE_CACHE.add(key, image)
+
+        return image
+
     @staticmethod
     def make_text_image(text, cutoff, nl, buffer, font, color):
-        text = TextGraphics.get_text(text, cutoff, nl)
+        if type(text) != str:
+            text = tuple(text)
+        color = tuple(color)
+
+        key = text, cutoff, nl, buffer, font, color
+        image = TextGraphics.BLOCK_CACHE.get(key)
 
+        if image is None:
+            lines = TextGraphics.get_text(text, cutoff, nl)
+            image = TextGraphics.compose_text_image(
+                lines, buffer, font, color)
+            TextGraphics.BLOCK_CACHE.add(key, image)
+
+        return image
+
+    @staticmethod
+    def compose_text_image(text, buffer, font, color):
         line_images = []
         for line in text:
-            line_images.append(font.render(line, TEXT_ANTI_ALIAS, color))
+            line_images.append(TextGraphics.render_line(line, font, color))
 
         widest = sorted(line_images, key=lambda l: -1 * l.get_size()[0])[0]
         line_height = (line_images[0].get_size()[1] + buffer)
@@ -415,7 +557,7 @@ class TextGraphics(Graphics):
     def get_char_size(style_dict=None, key="main"):
         if not style_dict:
             style_dict = {}
-        s = Style(style_dict)
+        s = Style.get_style(style_dict)
         font = s.get_font(key)
 
         return font.render(" ", 1, (0, 0, 0)).get_size()
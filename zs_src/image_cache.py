@@ -0,0 +1,268 @@
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+import pygame
+
+from zs_constants.zs import IMAGE_CACHE_BUDGET
+from zs_src.asset_loader import load_images
+from zs_src.atlas import get_atlas_image
+
+AUTO = "auto"
+CONVERT_MODES = AUTO, "convert", "convert_alpha", None
+
+
+class SurfaceCache:
+    """
+    A SurfaceCache holds surfaces that are expensive to make under
+    hashable keys. It keeps track of the approximate memory used by its
+    surfaces (width * height * bytes per pixel) and evicts the least
+    recently used entries when that exceeds its budget. Evicted surfaces
+    stay valid for any object still holding a reference; they are just
+    made again the next time they're asked for.
+
+    Cached surfaces are shared, so callers must not draw on them.
+    """
+    def __init__(self, name, budget):
+        self.name = name
+        self.budget = budget
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()     # key: (surface, bytes)
+
+    def __repr__(self):
+        n, e, s = self.name, len(self._entries), self.size
+
+        return "{} '{}' with {} surfaces, {} bytes".format(
+            self.__class__.__name__, n, e, s)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def get_surface_size(surface):
+        w, h = surface.get_size()
+
+        return w * h * surface.get_bytesize()
+
+    # returns None on a miss
+    def get(self, key):
+        entries = self._entries
+
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+
+            return entries[key][0]
+
+        self.misses += 1
+
+    def add(self, key, surface):
+        if key in self._entries:
+            self.size -= self._entries[key][1]
+
+        size = self.get_surface_size(surface)
+        self._entries[key] = surface, size
+        self.size += size
+
+        self.evict()
+
+    # the most recently used surface is never evicted so that a surface
+    # larger than the whole budget can still be returned
+    def evict(self):
+        entries = self._entries
+
+        while self.size > self.budget and len(entries) > 1:
+            key, (surface, size) = entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            self.on_evict(key)
+
+    def on_evict(self, key):
+        pass
+
+    def set_budget(self, budget):
+        self.budget = budget
+        self.evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+
+        return {
+            "surfaces": len(self._entries),
+            "size": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hit_rate
+        }
+
+
+class ImageCache(SurfaceCache):
+    """
+    An ImageCache loads each image file once and hands out the same
+    surface to every caller that asks for it. Entries are keyed by
+    (path, colorkey, convert mode) since the same file loaded with a
+    different colorkey or pixel format is a different surface.
+
+    Colorkeyed images use the top left pixel as their colorkey. Images
+    are converted to the display pixel format as they are loaded: 'auto'
+    uses convert_alpha() for images with per pixel alpha and convert()
+    otherwise, and colorkeyed images get an RLE accelerated colorkey.
+    Images loaded before the display exists are cached as they were
+    loaded and converted later by convert_images().
+    """
+    BUDGET = IMAGE_CACHE_BUDGET
+
+    def __init__(self, name, budget=BUDGET):
+        super(ImageCache, self).__init__(name, budget)
+        self._deferred = set()
+
+    @staticmethod
+    def get_key(path, colorkey=False, convert=AUTO):
+        if convert not in CONVERT_MODES:
+            raise ValueError("bad convert mode '{}'".format(convert))
+
+        return path, bool(colorkey), convert
+
+    @staticmethod
+    def convert_image(image, colorkey, convert):
+        if convert == AUTO:
+            alpha = image.get_flags() & pygame.SRCALPHA
+            if alpha and not colorkey:
+                convert = "convert_alpha"
+            else:
+                convert = "convert"
+
+        if convert:
+            image = getattr(image, convert)()
+        if colorkey:
+            image.set_colorkey(image.get_at((0, 0)), pygame.RLEACCEL)
+
+        return image
+
+    # atlas regions are converted along with their atlas page. An image
+    # that was already decoded by preload() can be passed in
+    def load_image(self, key, image=None):
+        path, colorkey, convert = key
+        display = pygame.display.get_surface()
+
+        if image is None:
+            image = get_atlas_image(path)
+            if image:
+                if not display:
+                    self._deferred.add(key)
+
+                return image
+
+            image = pygame.image.load(path)
+
+        if display:
+            image = self.convert_image(image, colorkey, convert)
+        else:
+            if colorkey:
+                image.set_colorkey(image.get_at((0, 0)))
+            self._deferred.add(key)
+
+        return image
+
+    def get_image(self, path, colorkey=False, convert=AUTO):
+        key = self.get_key(path, colorkey, convert)
+        image = self.get(key)
+
+        if image is None:
+            image = self.load_image(key)
+            self.add(key, image)
+
+        return image
+
+    # decodes the images that aren't cached or in the texture atlas on
+    # the asset loader's threads, then converts and caches them here on
+    # the main thread. images can hold surfaces that were already
+    # decoded, by path
+    def preload(self, paths, colorkey=False, convert=AUTO, progress=None,
+                images=None):
+        keys = [self.get_key(path, colorkey, convert) for path in paths]
+        keys = [k for k in dict.fromkeys(keys) if k not in self._entries
+                and get_atlas_image(k[0]) is None]
+
+        images = dict(images or {})
+        images.update(load_images(
+            [k[0] for k in keys if k[0] not in images], progress))
+        for key in keys:
+            self.add(key, self.load_image(key, images[key[0]]))
+
+        return len(keys)
+
+    def on_evict(self, key):
+        self._deferred.discard(key)
+
+    # returns the number of images that were converted. Callers that
+    # kept a reference to a deferred image need to get it again
+    def convert_images(self):
+        if not pygame.display.get_surface():
+            return 0
+
+        entries = self._entries
+        deferred = [k for k in self._deferred if k in entries]
+        self._deferred.clear()
+
+        # converting can change an entry's size and evict others
+        for key in deferred:
+            if key not in entries:
+                continue
+
+            path, colorkey, convert = key
+            image = get_atlas_image(path)
+            if not image:
+                image = self.convert_image(
+                    entries[key][0], colorkey, convert)
+            self.add(key, image)
+
+        return len(deferred)
+
+    def clear(self):
+        super(ImageCache, self).clear()
+        self._deferred.clear()
+
+    def get_stats(self):
+        stats = super(ImageCache, self).get_stats()
+        stats["deferred"] = len(self._deferred)
+
+        return stats
+
+
+IMAGE_CACHE = ImageCache("images")
+CONTENT_KEYS = WeakKeyDictionary()     # surface: content key
+
+
+# a key made from a surface's size, colorkey and pixels, so that cache
+# entries made from a surface don't depend on its id, which can be
+# reused once the surface is garbage collected. Keys are remembered
+# per surface, so surfaces must not be drawn on after they're used
+def get_content_key(surface):
+    key = CONTENT_KEYS.get(surface)
+
+    if key is None:
+        data = pygame.image.tobytes(surface, "RGBA")
+        key = surface.get_size(), surface.get_colorkey(), hash(data)
+        CONTENT_KEYS[surface] = key
+
+    return key
+
+
+def get_image_cache():
+    return IMAGE_CACHE
+
+
+def load_image(path, colorkey=False, convert=AUTO):
+    return IMAGE_CACHE.get_image(path, colorkey, convert)
@@ -8,6 +8,7 @@ from zs_src.entities import Layer
 from zs_src.entities import RectRegion
 from zs_src.geometry import Vector, Wall, Rect
 from zs_src.graphics import IconGraphics
+from zs_src.image_cache import load_image
 from zs_src.layers.physics import PhysicsInterface
 
 
@@ -621,6 +622,7 @@ class CameraLayer(Layer):
             self.draw_bg_layers(sub_screen)
             self.camera.draw(
                 sub_screen, self.sub_layers)
+            self.flush_render_queue()
 
             sx, sy = self.size
             pygame.transform.scale(
@@ -631,6 +633,7 @@ class CameraLayer(Layer):
             self.draw_bg_layers(canvas)
             self.camera.draw(
                 canvas, self.sub_layers)
+            self.flush_render_queue()
 
     def draw_bg_layers(self, screen):
         for layer in self.bg_layers:
@@ -659,10 +662,8 @@ class ParallaxBgLayer(Layer):
     @staticmethod
     def get_bg_image(image_name):
         path = join(BG_LAYERS, image_name)
-        image = pygame.image.load(path)
-        image.set_colorkey(image.get_at((0, 0)))
 
-        return image
+        return load_image(path, colorkey=True)
 
     def draw(self, screen, offset=(0, 0)):
         sw, sh = screen.get_size()
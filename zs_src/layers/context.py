@@ -8,6 +8,10 @@ class ContextLayer(Layer):
         super(ContextLayer, self).__init__(name, **kwargs)
         self.context = None
         self.file_name = file_name
+        # called with (files loaded, total files) while the context's
+        # images are preloaded, so a loading screen can be drawn
+        self.load_progress = None
+        self._prepared = None
 
     def get_group(self, key):
         return self.context.groups_dict[key]
@@ -41,12 +45,25 @@ class ContextLayer(Layer):
                 "Camera", self.get_layer(
                     "Camera Layer").camera)
 
+    # parses the context file and decodes its images so that on_spawn()
+    # only has to build the layers
+    def prepare(self):
+        context = ContextManager(self)
+        context.decode_assets()
+        self._prepared = context
+
     def on_spawn(self):
-        self.context = ContextManager(self)
+        context, self._prepared = self._prepared, None
+        if not context:
+            context = ContextManager(self)
+
+        self.context = context
+        self.context.preload_assets(self.load_progress)
 
         self.context.set_up_commands()
         for name in self.context.layers_dict:
             self.context.load_layer(name)
+        self.context.set_up_render_queues()
 
         self.set_up_model()
         super(ContextLayer, self).on_spawn()
@@ -1,4 +1,5 @@
 from zs_constants.zs import DIALOG_POSITION
+from zs_src.classes import Observable
 from zs_src.entities import Layer
 from zs_src.sprites import menus_gui
 
@@ -119,8 +120,8 @@ class Menu(Layer):
                 current.active_option.handle_event(deselect)
 
         if to_parent:
-            if hasattr(current, "pointer"):
-                current.pointer = current.pointer_origin
+            if hasattr(current, "reset_pointer"):
+                current.reset_pointer()
             select = ("select", ("no_show", True))
             self.return_block = block.parent
 
@@ -241,12 +242,30 @@ class HudTools:
     def model(self):
         return self.layer.model
 
-    def make_reporter_sprite(self, obj, function, **kwargs):
+    # a reporter that names the Observable fields its function reads is
+    # only updated when one of them changes. Without a function it shows
+    # the values of those fields. A function without fields can read
+    # anything, so it's polled
+    def make_reporter_sprite(self, obj, function=None, fields=None,
+                             **kwargs):
         ts = self.TextSprite("", name=obj.name + " reporter", **kwargs)
         value_name = "_" + obj.name + str(ts.id_num)
 
+        if fields:
+            for field in fields:
+                if not Observable.is_field(obj, field):
+                    raise ValueError(
+                        "'{}' is not an Observable field of {}".format(
+                            field, obj))
+
+        if not function:
+            def function(o):
+                return ", ".join(
+                    "{}: {}".format(field, getattr(o, field))
+                    for field in fields)
+
         self.model.set_value(value_name, "None")
-        self.model.link_object(obj, value_name, function)
+        self.model.link_object(obj, value_name, function, poll=not fields)
         self.link_value_to_sprite_text(ts, value_name)
 
         return ts
@@ -361,6 +380,7 @@ class MenuTools(HudTools):
     CheckBox = menus_gui.CheckBox
     SubBox = menus_gui.SubBox
     OptionBlock = menus_gui.OptionBlock
+    ScrollingOptionBlock = menus_gui.ScrollingOptionBlock
     DialogBlock = menus_gui.DialogBlock
     InputBlock = menus_gui.InputBlock
     FunctionBlock = menus_gui.FunctionBlock
@@ -373,6 +393,17 @@ class MenuTools(HudTools):
 
         return main_block
 
+    # a scrolling main block only makes options for the items in its
+    # window. It's shown with its menu, so the window is made right away
+    def make_scrolling_main_block(self, get_option, set_option=None,
+                                  **kwargs):
+        main_block = self.ScrollingOptionBlock(
+            "main block", [], get_option, set_option,
+            title=self.layer.name, lazy=False, **kwargs)
+        self.layer.add_main_block(main_block)
+
+        return main_block
+
     def make_sub_block(self, name, block, option, **kwargs):
         sub_block = self.OptionBlock(name, **kwargs)
         self.layer.add_sub_block(block, sub_block, option)
@@ -526,6 +557,32 @@ class MenuTools(HudTools):
         block.event_handler.set_event_method(
             trigger, set_activation_events)
 
+    # the block keeps its place when the value changes but its items
+    # don't, so that editing an item doesn't scroll back to the top.
+    # The sub blocks of the options it had are killed along with them
+    def link_value_to_scrolling_block(self, block, value_name):
+        model = self.model
+
+        def change_function(value):
+            for option in block.option_list:
+                if option.child:
+                    option.child.handle_event("die")
+
+            select = "select"
+            if list(value) == block.items:
+                block.refresh_window()
+                select = ("select", ("no_sound", True))
+            else:
+                block.set_items(value)
+
+            if self.layer.active_block is block:
+                if block.active_option:
+                    block.active_option.queue_events(select)
+            self.handle_change_linked_value(block, value_name, value)
+
+        model.link_value(value_name, change_function)
+        model.handle_change(value_name)
+
     def link_option_block_to_value(self, block, value_name):
         model = self.model
 
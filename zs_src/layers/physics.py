@@ -1,5 +1,5 @@
 from zs_constants.zs import FRAME_RATE, SCREEN_SIZE
-from zs_src.classes import CollisionSystem
+from zs_src.classes import CollisionSystem, Observable
 from zs_src.entities import Layer
 from zs_src.geometry import Vector, Rect
 
@@ -206,6 +206,14 @@ class HitboxLayer(Layer):
 class PhysicsInterface:
     Vector = Vector
 
+    # fields that models can link to without polling. The velocity and
+    # acceleration Vectors are changed in place, so they need polling
+    mass = Observable()
+    elasticity = Observable()
+    friction = Observable()
+    ground = Observable()
+    direction = Observable()
+
     def __init__(self, mass, elasticity):
         self.mass = mass
         self.elasticity = elasticity
@@ -27,9 +27,10 @@ class RegionLayer(Layer):
         return CollisionSystem.group_collision_system(check, handle, items, walls)
 
     def draw(self, screen, offset=(0, 0)):
-        for g in self.groups:
-            g.draw(screen, offset=offset)
+        self.draw_groups(screen, offset=offset)
+        self.flush_render_queue()
 
+        for g in self.groups:
             if self.walls_visible:
                 for item in g:
                     item.draw_walls(screen, offset=offset)
@@ -0,0 +1,490 @@
+import json
+from array import array
+from collections import deque
+from cProfile import Profile
+from os import makedirs
+from os.path import basename, dirname, join
+from pstats import Stats
+from time import perf_counter, strftime
+
+from zs_constants.paths import PROFILER_OUTPUT
+from zs_constants.zs import (
+    FRAME_PROFILER_WINDOW, FRAME_RECORDER_FRAMES, PROFILE_CAPTURE_FRAMES)
+
+FRAME_PROFILE_PATH = join(PROFILER_OUTPUT, "frame_profile.json")
+FRAME_TRACE_PATH = join(PROFILER_OUTPUT, "frames")
+RECORD_FRAMES_VARIABLE = "ZS_RECORD_FRAMES"
+
+# the timestamps a FrameRecorder takes each frame
+FRAME_START = 0
+INPUT_END = 1
+UPDATE_END = 2
+COLLISION_START = 3
+COLLISION_END = 4
+DRAW_END = 5
+FLIP_END = 6
+MARKS = 7
+
+# phase: (start mark, end mark)
+PHASES = {
+    "input": (FRAME_START, INPUT_END),
+    "update": (INPUT_END, UPDATE_END),
+    "collision": (COLLISION_START, COLLISION_END),
+    "draw": (UPDATE_END, DRAW_END),
+    "flip": (DRAW_END, FLIP_END)
+}
+
+PERCENTILES = 50, 90, 99
+
+
+def make_directory(path):
+    if dirname(path):
+        makedirs(dirname(path), exist_ok=True)
+
+
+class FrameProfiler:
+    """
+    A FrameProfiler times the parts of a frame that are passed to it
+    while it's enabled, under (owner, method name) keys: a layer's name
+    and 'draw', an entity's update methods, a collision system and so
+    on. The times of a key are added up over a frame and end_frame()
+    keeps each frame's total in a rolling window of the last 'window'
+    frames, which get_stats() turns into an average and percentiles.
+
+    Times are inclusive, so a layer's update_sub_layers time includes
+    the update methods of its sub layers. While the profiler is
+    disabled, call() just calls the method and nothing is recorded.
+    """
+    def __init__(self, name, window=FRAME_PROFILER_WINDOW):
+        self.name = name
+        self.window = window
+        self.enabled = False
+        self.frames = 0
+
+        self._frame = {}        # key: seconds so far this frame
+        self._samples = {}      # key: deque of frame totals
+
+    def __repr__(self):
+        return "FrameProfiler '{}' with {} timers".format(
+            self.name, len(self._samples))
+
+    def set_enabled(self, value):
+        self.enabled = value
+        self._frame = {}
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+        return self.enabled
+
+    def clear(self):
+        self.frames = 0
+        self._frame = {}
+        self._samples = {}
+
+    def add_time(self, key, seconds):
+        frame = self._frame
+        frame[key] = frame.get(key, 0) + seconds
+
+    def call(self, key, method, *args):
+        if not self.enabled:
+            return method(*args)
+
+        start = perf_counter()
+        result = method(*args)
+        self.add_time(key, perf_counter() - start)
+
+        return result
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+
+        samples = self._samples
+        for key, seconds in self._frame.items():
+            if key not in samples:
+                samples[key] = deque(maxlen=self.window)
+            samples[key].append(seconds)
+
+        self._frame = {}
+        self.frames += 1
+
+    # nearest rank percentile of a sorted list
+    @staticmethod
+    def get_percentile(ordered, p):
+        i = max(0, -(-len(ordered) * p // 100) - 1)
+
+        return ordered[i]
+
+    # times are in milliseconds
+    def get_stats(self, key):
+        ordered = sorted(self._samples[key])
+        ms = 1000
+        stats = {
+            "frames": len(ordered),
+            "mean": sum(ordered) / len(ordered) * ms,
+            "max": ordered[-1] * ms
+        }
+        for p in PERCENTILES:
+            stats["p{}".format(p)] = self.get_percentile(ordered, p) * ms
+
+        return stats
+
+    # keys sorted by their average time, slowest first
+    def get_keys(self):
+        samples = self._samples
+
+        return sorted(
+            samples, key=lambda k: -sum(samples[k]) / len(samples[k]))
+
+    @staticmethod
+    def get_key_name(key):
+        return "{}: {}".format(*key)
+
+    def get_report(self):
+        return {
+            self.get_key_name(key): self.get_stats(key)
+            for key in self.get_keys()
+        }
+
+    # a line of text for the rank-th slowest key, for the debug HUD
+    def get_summary(self, rank):
+        if not self.enabled:
+            return "off" if rank == 0 else ""
+
+        keys = self.get_keys()
+        if rank >= len(keys):
+            return ""
+
+        key = keys[rank]
+        stats = self.get_stats(key)
+
+        return "{} {:.2f} / {:.2f} ms".format(
+            self.get_key_name(key), stats["mean"], stats["p90"])
+
+    def dump(self, path=FRAME_PROFILE_PATH):
+        data = {
+            "name": self.name,
+            "frames": self.frames,
+            "window": self.window,
+            "units": "ms",
+            "timers": self.get_report()
+        }
+
+        make_directory(path)
+        file = open(path, "w")
+        json.dump(data, file, indent=2)
+        file.close()
+
+        return data
+
+
+class FrameRecorder:
+    """
+    A FrameRecorder takes a perf_counter() timestamp at each phase
+    boundary of a frame (see the marks above) while it's enabled and
+    keeps them in an array that's allocated once, holding the last
+    'frames' frames and the one in progress. Taking a mark is one
+    array store, so the recorder can be left on during playtests.
+
+    The recorded frames can be exported as Chrome trace event JSON (for
+    chrome://tracing or Perfetto) and as CSV, with one row of phase
+    times per frame. Phases whose marks weren't taken in a frame, like
+    collision in an environment without collision systems, are left
+    out of that frame.
+    """
+    def __init__(self, name, frames=FRAME_RECORDER_FRAMES):
+        self.name = name
+        self.frames = frames
+        self.enabled = False
+
+        self.slots = frames + 1
+        self.times = array("d", [0.0]) * (self.slots * MARKS)
+        self.count = 0              # frames recorded
+        self.offset = 0             # start of the current frame's marks
+
+    def __repr__(self):
+        return "FrameRecorder '{}' with {} frames".format(
+            self.name, min(self.count, self.frames))
+
+    def set_enabled(self, value):
+        self.enabled = value
+        if value:
+            self.clear()
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+        return self.enabled
+
+    def clear(self):
+        self.count = 0
+        self.offset = 0
+        self.times[:MARKS] = array("d", [0.0]) * MARKS
+
+    def mark(self, i):
+        if self.enabled:
+            self.times[self.offset + i] = perf_counter()
+
+    # a frame that was already under way when the recorder was
+    # enabled is dropped
+    def end_frame(self):
+        if not self.enabled:
+            return
+
+        if self.times[self.offset + FRAME_START]:
+            self.mark(FLIP_END)
+            self.count += 1
+            self.offset = (self.count % self.slots) * MARKS
+
+        offset = self.offset
+        self.times[offset:offset + MARKS] = array("d", [0.0]) * MARKS
+
+    # the marks of each recorded frame, oldest first
+    def get_frames(self):
+        n = min(self.count, self.frames)
+        first = self.count - n
+        times = self.times
+
+        frames = []
+        for frame in range(first, self.count):
+            offset = (frame % self.slots) * MARKS
+            frames.append((frame, times[offset:offset + MARKS]))
+
+        return frames
+
+    @staticmethod
+    def get_phases(marks):
+        phases = []
+        for name, (start, end) in PHASES.items():
+            if marks[start] and marks[end]:
+                phases.append((name, marks[start], marks[end]))
+
+        return phases
+
+    # timestamps are in microseconds, from the first recorded frame
+    def get_trace(self):
+        frames = self.get_frames()
+        events = []
+        if not frames:
+            return events
+
+        zero = frames[0][1][FRAME_START]
+        for frame, marks in frames:
+            if marks[FRAME_START] and marks[FLIP_END]:
+                events.append(self.get_trace_event(
+                    "frame", marks[FRAME_START], marks[FLIP_END],
+                    zero, frame))
+
+            for name, start, end in self.get_phases(marks):
+                events.append(self.get_trace_event(
+                    name, start, end, zero, frame))
+
+        return events
+
+    @staticmethod
+    def get_trace_event(name, start, end, zero, frame):
+        us = 1000000
+
+        return {
+            "name": name,
+            "ph": "X",
+            "ts": (start - zero) * us,
+            "dur": (end - start) * us,
+            "pid": 0,
+            "tid": 0,
+            "args": {"frame": frame}
+        }
+
+    def export_trace(self, path):
+        make_directory(path)
+
+        data = {
+            "traceEvents": self.get_trace(),
+            "displayTimeUnit": "ms"
+        }
+        file = open(path, "w")
+        json.dump(data, file)
+        file.close()
+
+    # one row per frame: its start in milliseconds from the first
+    # frame, the time of each phase and the whole frame's time in
+    # milliseconds. Phases that weren't marked are left blank
+    def export_csv(self, path):
+        make_directory(path)
+
+        frames = self.get_frames()
+        ms = 1000
+        zero = frames[0][1][FRAME_START] if frames else 0
+
+        rows = [["frame", "start"] + list(PHASES) + ["total"]]
+        for frame, marks in frames:
+            phases = {
+                name: end - start
+                for name, start, end in self.get_phases(marks)
+            }
+            row = [frame, (marks[FRAME_START] - zero) * ms]
+            row += [phases[name] * ms if name in phases else ""
+                    for name in PHASES]
+            row.append((marks[FLIP_END] - marks[FRAME_START]) * ms)
+            rows.append(row)
+
+        file = open(path, "w")
+        for row in rows:
+            file.write(",".join(
+                "{:.4f}".format(v) if type(v) is float else str(v)
+                for v in row) + "\n")
+        file.close()
+
+    # writes path.json and path.csv
+    def export(self, path=FRAME_TRACE_PATH):
+        self.export_trace(path + ".json")
+        self.export_csv(path + ".csv")
+
+
+class ProfileCapture:
+    """
+    A ProfileCapture runs the next 'frames' calls passed to call() under
+    cProfile once start() is called, then writes the profile into its
+    output directory as a .pstats file (for pstats or snakeviz) and a
+    collapsed stack text file that flamegraph.pl and speedscope can read.
+
+    cProfile only records which function called which, not whole call
+    stacks, so the collapsed stacks are rebuilt from the caller graph:
+    a function's time is split between its callers in proportion to
+    the time each call edge took. A call back into a function that's
+    already on the stack ends that stack, so time under recursive calls
+    (like nested layers drawn through FrameProfiler.call) is only
+    approximate; the .pstats file has the exact numbers.
+    """
+    MAX_DEPTH = 64
+    MIN_TIME = .00001          # seconds; shorter stacks are left out
+    PROFILER_DISABLE = (
+        "~", 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+
+    def __init__(self, name, frames=PROFILE_CAPTURE_FRAMES,
+                 directory=PROFILER_OUTPUT):
+        self.name = name
+        self.frames = frames
+        self.directory = directory
+
+        self.profile = None
+        self.remaining = 0
+        self.captures = 0
+        self.last_path = None
+
+    def __repr__(self):
+        return "ProfileCapture '{}' with {} captures".format(
+            self.name, self.captures)
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    # a capture that's already running isn't restarted
+    def start(self, frames=None):
+        if self.active:
+            return
+
+        self.profile = Profile()
+        self.remaining = frames or self.frames
+
+    def call(self, method, *args):
+        if not self.active:
+            return method(*args)
+
+        result = self.profile.runcall(method, *args)
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finish()
+
+        return result
+
+    # returns the path of the capture, without an extension
+    def finish(self):
+        profile = self.profile
+        self.profile = None
+        self.remaining = 0
+
+        self.captures += 1
+        path = join(self.directory, "capture_{}_{}".format(
+            strftime("%Y%m%d_%H%M%S"), self.captures))
+        make_directory(path)
+
+        profile.dump_stats(path + ".pstats")
+        stats = Stats(profile).stats
+        file = open(path + ".collapsed.txt", "w")
+        for stack, us in self.get_collapsed_stacks(stats).items():
+            file.write("{} {}\n".format(stack, us))
+        file.close()
+
+        self.last_path = path
+
+        return path
+
+    @staticmethod
+    def get_function_name(function):
+        file_name, line, name = function
+        if file_name == "~":
+            text = name
+        else:
+            text = "{}:{}({})".format(basename(file_name), line, name)
+
+        return text.replace(";", ",").replace(" ", "_")
+
+    # stack ("a;b;c"): microseconds of self time. stats is the 'stats'
+    # dict of a pstats.Stats object
+    def get_collapsed_stacks(self, stats):
+        callees = {}
+        for function, (cc, nc, tt, ct, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((function, edge[3]))
+
+        # cProfile records its own disable() call, with no callers
+        roots = [f for f, s in stats.items()
+                 if not any(c in stats for c in s[4])
+                 and f != self.PROFILER_DISABLE]
+        stacks = {}
+
+        def add_stacks(function, path, share):
+            cc, nc, tt, ct, callers = stats[function]
+            path = path + (function,)
+
+            us = round(tt * share * 1000000)
+            if us:
+                stack = ";".join(self.get_function_name(f) for f in path)
+                stacks[stack] = stacks.get(stack, 0) + us
+
+            if len(path) >= self.MAX_DEPTH:
+                return
+
+            for callee, edge_time in callees.get(function, []):
+                callee_time = stats[callee][3]
+                if callee in path or not callee_time:
+                    continue
+
+                callee_share = share * edge_time / callee_time
+                if callee_time * callee_share >= self.MIN_TIME:
+                    add_stacks(callee, path, min(callee_share, 1))
+
+        for root in roots:
+            add_stacks(root, (), 1)
+
+        return stacks
+
+
+PROFILER = FrameProfiler("frames")
+RECORDER = FrameRecorder("frames")
+CAPTURE = ProfileCapture("frames")
+
+
+def get_profiler():
+    return PROFILER
+
+
+def get_frame_recorder():
+    return RECORDER
+
+
+def get_profile_capture():
+    return CAPTURE
@@ -1,12 +1,15 @@
 import json
 from os.path import join
+from weakref import WeakValueDictionary
 
 import pygame
 
 from zs_constants.paths import IMAGES, SOUNDS, RESOURCE_DICTS
+from zs_src.atlas import convert_atlas
+from zs_src.bitmap_font import BitmapFont
+from zs_src.image_cache import load_image, get_image_cache
 
 pygame.init()
-load_image = pygame.image.load
 load_sound = pygame.mixer.Sound
 
 
@@ -21,10 +24,100 @@ def load_json(file_name):
 
 
 class ResourceLibrary(dict):
+    """
+    A ResourceLibrary maps resource names to loaded images, sounds and
+    fonts. get_resources() doesn't load anything, it adds a loader for
+    each entry and the entry is loaded the first time it's looked up,
+    so importing the style module doesn't load every resource before
+    the display exists.
+
+    warm_up() loads a named subset of the pending entries (or all of
+    them) ahead of time, for example while a loading screen is shown.
+
+    Pending entries count as entries: 'in', get(), len(), keys() and
+    iteration include them without loading them, while values() and
+    items() load every pending entry.
+    """
+    LIBRARIES = WeakValueDictionary()       # key: id(library)
+
+    def __init__(self, *args, **kwargs):
+        super(ResourceLibrary, self).__init__(*args, **kwargs)
+        self.image_names = []
+        self._loaders = {}      # key: (method, args)
+        ResourceLibrary.LIBRARIES[id(self)] = self
+
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+
+        method, args = self._loaders.pop(key)
+        method(*args)
+
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._loaders
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._loaders)
+
+    def keys(self):
+        return list(dict.keys(self)) + list(self._loaders)
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        else:
+            return default
+
+    @property
+    def pending(self):
+        return list(self._loaders)
+
+    def add_loader(self, key, method, *args):
+        self._loaders[key] = method, args
+
+    # pending images are decoded in parallel by the image cache first
+    def warm_up(self, *keys, progress=None):
+        if not keys:
+            keys = self.pending
+
+        unknown = [k for k in keys if k not in self]
+        if unknown:
+            raise KeyError("warm_up() got unknown resource names {}".format(
+                ", ".join(repr(k) for k in unknown)))
+
+        loaders = self._loaders
+        paths = [join(IMAGES, k) for k in keys
+                 if k in loaders and loaders[k][0] == self.add_image]
+        get_image_cache().preload(paths)
+
+        for i, key in enumerate(keys):
+            self[key]
+
+            if progress:
+                progress(i + 1, len(keys))
+
     def add_image(self, file_name):
         path = join(IMAGES, file_name)
         self[file_name] = load_image(path)
 
+        if file_name not in self.image_names:
+            self.image_names.append(file_name)
+
+    def reload_images(self):
+        for file_name in self.image_names:
+            self.add_image(file_name)
+
     def add_sound(self, file_name):
         path = join(SOUNDS, file_name)
         self[file_name] = load_sound(path)
@@ -33,8 +126,13 @@ class ResourceLibrary(dict):
         bold = "bold" in args
         italic = "italic" in args
         path = pygame.font.match_font(name, bold, italic)
+        font = pygame.font.Font(path, size)
 
-        self[key] = pygame.font.Font(path, size)
+        # a 'bitmap' font lays out text from a pre-rendered glyph atlas
+        if "bitmap" in args:
+            font = BitmapFont(font)
+
+        self[key] = font
 
 
 def get_resources(name):
@@ -43,18 +141,33 @@ def get_resources(name):
     rl = ResourceLibrary()
     if "images" in rd:
         for name in rd["images"]:
-            rl.add_image(name)
+            rl.add_loader(name, rl.add_image, name)
 
     if "sounds" in rd:
         for name in rd["sounds"]:
-            rl.add_sound(name)
+            rl.add_loader(name, rl.add_sound, name)
 
     if "fonts" in rd:
         for name in rd["fonts"]:
             entry = rd["fonts"][name]
             font_name, size = entry[0], entry[1]
             args = entry[2:]
-            rl.add_font(name, font_name, size, *args)
+            rl.add_loader(
+                name, rl.add_font, name, font_name, size, *args)
 
     return rl
 
+
+# images loaded before the display was created (like Style.RESOURCES
+# entries that were warmed up early) can't be converted to the display
+# pixel format until it exists. This converts the atlas pages and the
+# deferred images in the image cache, then swaps the converted images
+# into every ResourceLibrary
+def post_process_resources():
+    if not pygame.display.get_surface():
+        return
+
+    convert_atlas()
+    if get_image_cache().convert_images():
+        for library in list(ResourceLibrary.LIBRARIES.values()):
+            library.reload_images()
@@ -1,24 +1,23 @@
 from zs_constants import gui as constants
 from zs_constants.style import L, C, R, T, B
 from zs_src.classes import MemberTable
-from zs_src.entities import Sprite
+from zs_src.entities import Sprite, get_layout_queue
 from zs_src.graphics import ContainerGraphics, TextGraphics
 from zs_src.style import StyleInterface
 
 
 class GuiSprite(StyleInterface, Sprite):
     EVENT_NAMES = ("change_position", "change_size")
+    # set on containers whose layout is waiting in the layout queue
+    layout_pending = False
 
     def __init__(self, name, **kwargs):
-        StyleInterface.__init__(self)
+        StyleInterface.__init__(self, kwargs.get("style_dict"))
 
         size = kwargs.get("size", (1, 1))
         position = kwargs.get("position", (0, 0))
         Sprite.__init__(self, name, size=size, position=position)
 
-        style_dict = kwargs.get("style_dict")
-        if style_dict:
-            self.style.change_dict(style_dict)
         self.add_event_methods(*GuiSprite.EVENT_NAMES)
 
         self.selectable = False
@@ -29,10 +28,27 @@ class GuiSprite(StyleInterface, Sprite):
         self.ui_directions = []
         self.return_command_names = constants.B
 
+    # a sprite's position is only up to date once the layout of the
+    # container it's in has been updated
+    @property
+    def position(self):
+        parent = self.parent
+        if parent is not None and parent.layout_pending:
+            parent.update_layout()
+
+        return self.rect.position
+
+    @position.setter
+    def position(self, value):
+        self.adjust_position(value)
+
     def adjust_position(self, value):
         super(GuiSprite, self).adjust_position(value)
         self.handle_event("change_position")
 
+    def update_layout(self):
+        pass
+
     def adjust_style(self, value):
         super(GuiSprite, self).adjust_style(value)
         if self.graphics:
@@ -128,7 +144,8 @@ class ContainerSprite(GuiSprite):
             sprite.remove_event_listener(
                 "change_size", "change_member_size")
             sprite.set_event_listener(
-                "change_size", "change_member_size", self)
+                "change_size",
+                ("change_member_size", ("member", sprite)), self)
             sprite.parent = self
 
             for group in self.groups:
@@ -163,6 +180,27 @@ class ContainerSprite(GuiSprite):
         for sprite in self.member_list:
             sprite.handle_event("spawn")
 
+    # the size and image are only up to date once a pending layout has
+    # been updated
+    @property
+    def size(self):
+        if self.layout_pending:
+            self.update_layout()
+
+        return self.rect.size
+
+    @size.setter
+    def size(self, value):
+        self.adjust_size(value)
+
+    @property
+    def image(self):
+        if self.layout_pending:
+            self.update_layout()
+
+        if self.graphics:
+            return self.graphics.get_image()
+
     @property
     def members(self):
         return self.member_table.members
@@ -206,6 +244,7 @@ class ContainerSprite(GuiSprite):
         for item in self.member_list:
             item.adjust_style(value)
 
+        self.member_table.mark_dirty()
         self.handle_event("change_member_size")
         # self.set_member_positions()
         # self.set_size_to_table()
@@ -216,7 +255,9 @@ class ContainerSprite(GuiSprite):
 
     def adjust_position(self, value):
         super(ContainerSprite, self).adjust_position(value)
-        self.set_member_positions()
+
+        if not self.layout_pending:
+            self.set_member_positions()
 
     def set_member_positions(self):
         s = self.style
@@ -230,64 +271,163 @@ class ContainerSprite(GuiSprite):
 
     def set_size_to_table(self):
         s = self.style
-        self.size = self.initial_size
-        self.size = self.member_table.adjust_size(
-            self.size, s.border_size, s.buffers["cell"])
+        size = self.member_table.adjust_size(
+            self.initial_size, s.border_size, s.buffers["cell"])
+
+        if size != self.rect.size:
+            self.size = size
+
+    # changes to the members only mark the layout as out of date and
+    # queue the container in the layout queue (if it's in a group),
+    # which is flushed before the next Layer.draw(). Only the row of
+    # the member that changed size is measured again. The containers
+    # this one is in are marked too, so that reading their size updates
+    # this layout first
+    def invalidate_layout(self, member=None):
+        if member:
+            self.member_table.mark_dirty(member)
+
+        if not self.layout_pending:
+            self.layout_pending = True
+            if self.groups:
+                get_layout_queue().add(self)
+
+            parent = self.parent
+            if isinstance(parent, ContainerSprite):
+                parent.invalidate_layout()
+
+    def update_layout(self):
+        if not self.layout_pending:
+            return
 
-    def on_change_member_size(self):
-        old = self.size
+        # nested containers go first so that their sizes are known
+        for sprite in self.member_list:
+            if sprite and sprite.layout_pending:
+                sprite.update_layout()
+
+        self.layout_pending = False
+        get_layout_queue().discard(self)
+
+        old = self.rect.size
         self.set_size_to_table()
         self.set_member_positions()
 
-        if self.size != old and self.graphics:
-            self.graphics.change_size()
+        if self.rect.size != old:
+            if self.graphics:
+                self.graphics.change_size()
+
+            parent = self.parent
+            if isinstance(parent, ContainerSprite):
+                parent.invalidate_layout(self)
 
+    def on_change_member_size(self):
+        self.invalidate_layout(self.event.get("member"))
+
+    # only containers that are in a group (and so can be drawn) are kept
+    # in the layout queue. Killed containers and ones that haven't
+    # spawned yet are laid out when they're read, or queued again when
+    # they're added to a group
     def add(self, *groups):
         super(ContainerSprite, self).add(*groups)
 
         for sprite in self.member_list:
             sprite.add(*groups)
 
+        if self.layout_pending and self.groups:
+            get_layout_queue().add(self)
+
     def remove(self, *groups):
         super(ContainerSprite, self).remove(*groups)
 
         for sprite in self.member_list:
             sprite.remove(*groups)
 
+        if not self.groups:
+            get_layout_queue().discard(self)
+
     def kill(self):
         super(ContainerSprite, self).kill()
 
         for sprite in self.member_list:
             sprite.kill()
 
-    def on_dying(self):
-        ratio = 1 - self.event.timer.get_ratio()
+    # containers with a background color fade in and out. The container
+    # image is rendered once and drawn with a surface alpha each frame
+    def on_spawning(self):
+        if self.style.colors["bg"]:
+            self.graphics.set_fade(self.event.timer.get_ratio())
 
-        bg_color = self.style.colors["bg"]
-        if bg_color:
-            new_color = tuple([value * ratio for value in bg_color])
-            self.bg_color = new_color
-            self.reset_image()
+    def on_birth(self):
+        super(ContainerSprite, self).on_birth()
+        self.graphics.set_fade(None)
 
-    def on_spawning(self):
-        ratio = self.event.timer.get_ratio()
+    def on_dying(self):
+        if self.style.colors["bg"]:
+            self.graphics.set_fade(1 - self.event.timer.get_ratio())
 
-        bg_color = self.style.colors["bg"]
-        if bg_color:
-            new_color = tuple([round(value * ratio) for value in bg_color])
-            self.bg_color = new_color
-            self.reset_image()
+    def on_death(self):
+        super(ContainerSprite, self).on_death()
+        self.graphics.set_fade(None)
 
 # GUI Member Table classes
 
 
 class GuiMemberTable(MemberTable):
+    """
+    A GuiMemberTable lays its members out as rows of sprites inside a
+    ContainerSprite's body. The size of each member and the minimum size
+    of each row are cached by row, and a row is only measured again when
+    its members are replaced or one of them is passed to mark_dirty().
+    set_member_positions() works out every position in one pass over
+    the cached measurements and only moves members whose position
+    changed.
+
+    Members that change size without a 'change_size' event need to be
+    marked dirty, and mark_dirty() with no arguments drops every cached
+    measurement.
+    """
+    def __init__(self, name, members=None):
+        super(GuiMemberTable, self).__init__(name, members)
+
+        # (row tuple, buff_w): (member sizes, row size)
+        self._row_measurements = {}
+        self._dirty = set()
+
     # def set_member_listeners(self, event_name, response_event, target, temp=False):
     #     for member in self.member_list:
     #         member.remove_event_listener(event_name, response_event)
     #         member.set_event_listener(
     #             event_name, response_event, target, temp)
 
+    def mark_dirty(self, *members):
+        if members:
+            self._dirty.update(members)
+        else:
+            self._row_measurements.clear()
+
+    # returns a (member sizes, row size) tuple for each row. Rows that
+    # are no longer in the table are dropped from the cache
+    def get_row_measurements(self, buff_w):
+        cache, dirty = self._row_measurements, self._dirty
+        measured = {}
+        measurements = []
+
+        for row in self.members:
+            key = tuple(row), buff_w
+            m = cache.get(key)
+
+            if m is None or (dirty and not dirty.isdisjoint(row)):
+                sizes = [getattr(item, "size", (0, 0)) for item in row]
+                m = sizes, self.get_row_size(sizes, buff_w)
+
+            measured[key] = m
+            measurements.append(m)
+
+        self._row_measurements = measured
+        dirty.clear()
+
+        return measurements
+
     def adjust_size(self, size, border_size, buffers):
         w, h = size
         border_w, border_h = border_size
@@ -306,40 +446,37 @@ class GuiMemberTable(MemberTable):
         return w, h
 
     def get_minimum_body_size(self, buffers):
-        members = self.members
-        r_widths, r_heights = [], []
         buff_w, buff_h = buffers
+        measurements = self.get_row_measurements(buff_w)
 
-        for row in members:
-            row_w, row_h = self.get_minimum_row_size(row, buff_w)
-            r_widths.append(row_w)
-            r_heights.append(row_h)
+        return self.get_body_size(
+            [m[1] for m in measurements], buff_h)
 
-        try:
-            width = sorted(r_widths, key=lambda x: x * -1)[0]
-        except IndexError:
-            width = 0
-        height = sum(r_heights) + ((len(r_heights) - 1) * buff_h)
+    @staticmethod
+    def get_body_size(row_sizes, buff_h):
+        width = max([w for w, h in row_sizes], default=0)
+        height = sum([h for w, h in row_sizes])
+        height += (len(row_sizes) - 1) * buff_h
 
         return width, height
 
     @staticmethod
     def get_minimum_row_size(row, buff_w):
-        row_w, row_h = 0, 0
-        item_widths = []
+        sizes = [getattr(item, "size", (0, 0)) for item in row]
 
-        for item in row:
-            w, h = getattr(item, "size", (0, 0))
-            item_widths.append(w)
+        return GuiMemberTable.get_row_size(sizes, buff_w)
 
-            if h > row_h:
-                row_h = h
-        row_w = sum(item_widths) + ((len(row) - 1) * buff_w)
+    @staticmethod
+    def get_row_size(sizes, buff_w):
+        row_w = sum([w for w, h in sizes]) + ((len(sizes) - 1) * buff_w)
+        row_h = max([h for w, h in sizes], default=0)
 
         return row_w, row_h
 
     def set_member_positions(self, position, size, border_size, buffers, aligns):
-        if self.member_list:
+        members = self.members
+
+        if any(members):
             parent_x, parent_y = position
             w, h = size
             align_h, align_v = aligns
@@ -348,22 +485,23 @@ class GuiMemberTable(MemberTable):
 
             edge_x, edge_y = border_w + buff_w, border_h + buff_h
             body_w, body_h = w - (edge_x * 2), h - (edge_y * 2)
-            get_cell_size = lambda items: (body_w / len(items), body_h / len(self.members))
+
+            measurements = self.get_row_measurements(buff_w)
+            min_h = self.get_body_size(
+                [m[1] for m in measurements], buff_h)[1]
+            b_edge = body_h - min_h
+            cell_h = body_h / len(members)
 
             i, y_disp = 0, 0
-            for row in self.members:
+            for row, (sizes, (row_w, row_h)) in zip(members, measurements):
                 if row:
-                    cell_w, cell_h = get_cell_size(row)
-
-                    row_w, row_h = self.get_minimum_row_size(row, buff_w)
+                    cell_w = body_w / len(row)
+                    r_offset = body_w - row_w
 
                     j, x_disp = 0, 0
-                    for item in row:
+                    for item, (item_w, item_h) in zip(row, sizes):
                         if item:
-                            item_w, item_h = item.size
                             x, y = edge_x, edge_y
-                            r_offset = body_w - row_w
-                            b_edge = body_h - self.get_minimum_body_size(buffers)[1]
 
                             x += {
                                 L: x_disp,
@@ -374,7 +512,9 @@ class GuiMemberTable(MemberTable):
                                 C: (i * cell_h) + ((cell_h - item_h) / 2),
                                 B: b_edge + y_disp}[align_v]
 
-                            item.position = parent_x + x, parent_y + y
+                            position = parent_x + x, parent_y + y
+                            if item.position != position:
+                                item.position = position
                             x_disp += item_w + buff_w
                         j += 1
                     y_disp += row_h + buff_h
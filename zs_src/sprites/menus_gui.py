@@ -510,7 +510,7 @@ class OptionBlock(MenuBlock):
     def on_spawn(self):
         super(OptionBlock, self).on_spawn()
 
-        self.pointer = self.pointer_origin
+        self.reset_pointer()
         ao = self.active_option
         if ao:
             self.queue_events(("change_option",
@@ -543,6 +543,9 @@ class OptionBlock(MenuBlock):
             ao = None
         return ao
 
+    def reset_pointer(self):
+        self.pointer = self.pointer_origin
+
     def add_option(self, text, *args):
         option = TextOption(text)
         self.add_member_sprite(option, *args)
@@ -662,6 +665,211 @@ class OptionBlock(MenuBlock):
         pass
 
 
+class ScrollingOptionBlock(OptionBlock):
+    """
+    A ScrollingOptionBlock shows a long column of items through a window
+    of WINDOW_SIZE rows. Option sprites are only made for the rows in
+    the window and MARGIN rows on either side of it, so a list of
+    thousands of items costs about as much as a list of twenty. A lazy
+    block (the default) makes its window the first time it's added to
+    a group to be shown, otherwise the window is made when the block is.
+
+    get_option(item) makes the option for an item. If set_option(option,
+    item) is given, options that scroll out of range are kept and set to
+    show new items instead of being made again.
+
+    The pointer's row is the index of the active item. It moves one
+    item at a time, skipping options that aren't selectable and
+    wrapping around at either end, and the window scrolls to follow it,
+    so the select, deselect, activate and change_option events are the
+    same as an OptionBlock's. Only the rows that scroll into or out of
+    the window are added to or removed from the block.
+    """
+    WINDOW_SIZE = 12
+    MARGIN = 2
+
+    def __init__(self, name, items, get_option, set_option=None,
+                 window_size=WINDOW_SIZE, margin=MARGIN, lazy=True,
+                 **kwargs):
+        super(ScrollingOptionBlock, self).__init__(name, **kwargs)
+
+        self.items = list(items)
+        self.get_option = get_option
+        self.set_option = set_option
+        self.window_size = window_size
+        self.margin = margin
+        self.lazy = lazy
+
+        self.top = 0
+        self.window = None          # (first, last) visible items
+        self._options = {}          # item index: option
+        self._free = []
+
+        if not lazy:
+            self.show_window()
+
+    # the pointer's option is always in the window, since the pointer
+    # is only moved by cycle_pointer() and reset_pointer()
+    @property
+    def active_option(self):
+        option = self._options.get(self.pointer[0])
+
+        if option is not None and option.selectable:
+            return option
+
+    # the pointer starts on the first selectable item from its origin.
+    # A lazy block's window isn't made until show_window()
+    def reset_pointer(self):
+        self.pointer = self.pointer_origin
+        i = self.pointer[0]
+
+        if self.window is not None and 0 <= i < len(self.items):
+            self.scroll_to(i)
+            if not self._options[i].selectable:
+                self.cycle_pointer((0, 1))
+
+    def get_item_option(self, i):
+        self.scroll_to(i)
+
+        return self._options[i]
+
+    def cycle_pointer(self, direction):
+        y = direction[1]
+        n = len(self.items)
+
+        if y != 0 and n:
+            start = i = self.pointer[0]
+
+            # options in the margins are checked without scrolling
+            cycling = True
+            while cycling:
+                i = (i + y) % n
+                option = self._options.get(i)
+                if option is None:
+                    option = self.get_item_option(i)
+
+                cycling = not (i == start or option.selectable)
+
+            self.pointer = [i, 0]
+            self.scroll_to(i)
+
+    def scroll_to(self, i):
+        top, size = self.top, self.window_size
+
+        if i < top:
+            top = i
+        elif i >= top + size:
+            top = i - size + 1
+
+        if top != self.top or self.window is None:
+            self.top = top
+            self.update_window()
+
+    # options that leave the margins are only reused on the next scroll,
+    # so that the option that was just deselected can't come back as
+    # the option that is selected next
+    def update_window(self):
+        n = len(self.items)
+        first, last = self.top, min(n, self.top + self.window_size)
+        low, high = max(0, first - self.margin), min(n, last + self.margin)
+
+        options = self._options
+        released = [i for i in options if not low <= i < high]
+        free = self._free
+        self._free = []
+
+        for i in range(low, high):
+            if i not in options:
+                options[i] = self.make_option(i, free)
+
+        if self.set_option:
+            self._free = [options[i] for i in released]
+        for i in released:
+            del options[i]
+
+        old, self.window = self.window, (first, last)
+        if old is None or old[1] <= first or last <= old[0]:
+            for sprite in self.member_list:
+                sprite.kill()
+            self.set_table([options[i] for i in range(first, last)])
+        else:
+            self.move_window(old)
+
+    # rows that are still in the window stay where they are in the
+    # member table, only the rows at either end are swapped
+    def move_window(self, old):
+        (old_first, old_last), (first, last) = old, self.window
+        rows = self.member_table.members
+        top = 1 if self.title else 0
+
+        left = []
+        for i in range(old_first, first):
+            left += rows.pop(top)
+        for i in range(last, old_last):
+            left += rows.pop()
+        for sprite in left:
+            sprite.kill()
+
+        above = [self._options[i] for i in range(first, old_first)]
+        below = [self._options[i] for i in range(old_last, last)]
+        rows[top:top] = [[option] for option in above]
+        rows += [[option] for option in below]
+
+        self.add_to_container(*(above + below))
+
+    def make_option(self, i, free):
+        item = self.items[i]
+
+        if free:
+            option = free.pop()
+            self.set_option(option, item)
+        else:
+            option = self.get_option(item)
+
+        return option
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.pointer = self.pointer_origin
+        self.top = 0
+
+        self.clear_window()
+        if self.groups or not self.lazy:
+            self.show_window()
+
+    # makes the options in the window again, for items whose options
+    # need to show something that changed. The pointer stays where it is
+    def refresh_window(self):
+        self.clear_window()
+
+        if self.items and (self.groups or not self.lazy):
+            self.scroll_to(self.pointer[0])
+
+    def clear_window(self):
+        for sprite in self.member_list:
+            sprite.kill()
+
+        self.window = None
+        self._options = {}
+        self._free = []
+
+        self.set_table()
+
+    # a lazy block's window is made just before the block is first
+    # added to a group, so the options are added and spawned with it
+    def add(self, *groups):
+        if self.window is None:
+            self.show_window()
+
+        super(ScrollingOptionBlock, self).add(*groups)
+
+    def show_window(self):
+        if self.items:
+            self.scroll_to(self.pointer_origin[0])
+
+        self.reset_pointer()
+
+
 class DialogBlock(OptionBlock):
     def __init__(self, message, options=None, **kwargs):
         if options:
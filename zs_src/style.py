@@ -1,9 +1,12 @@
 import json
+from collections import OrderedDict
 from copy import deepcopy
 from os.path import join
+from weakref import WeakValueDictionary
 
 from zs_constants import paths
-from zs_constants.zs import GLOBAL_STYLE_DICT, GLOBAL_RESOURCE_DICT
+from zs_constants.zs import (
+    GLOBAL_STYLE_DICT, GLOBAL_RESOURCE_DICT, STYLE_CACHE_SIZE)
 from zs_src.resource_library import get_resources
 
 BG_STYLE = "bg_style"
@@ -66,8 +69,28 @@ def load_json(path, filename):
 
 
 class Style:
+    """
+    Style objects are shared and treated as immutable. get_style()
+    returns one interned Style for each distinct style_dict, so that the
+    hundreds of sprites in a big menu share a handful of validated Style
+    objects instead of each deep copying and checking the default dict.
+
+    change_dict() doesn't modify a Style. It returns the interned Style
+    for the changed dict, and remembers it so that applying the same
+    change again is a dict lookup (copy on write). StyleInterface swaps
+    its style for the new one. Callers must not modify the dicts that
+    the properties return.
+
+    Only the CACHE_SIZE most recently used styles are kept interned,
+    and a Style only holds its variants weakly, so styles made by per
+    frame changes (fades, highlights) don't pile up. A style that was
+    dropped is made again the next time it's asked for.
+    """
     DEFAULT_DICT = load_json(paths.STYLE_DICTS, GLOBAL_STYLE_DICT)     # default style_dict
     RESOURCES = get_resources(GLOBAL_RESOURCE_DICT)
+    CACHE_SIZE = STYLE_CACHE_SIZE
+    INTERNED = OrderedDict()        # frozen style_dict: Style
+    DEFAULT = None
     KEYS = (BG_STYLE,
             ALIGN_H,
             ALIGN_V,
@@ -79,16 +102,68 @@ class Style:
             SOUNDS,
             FONTS)
 
-    def __init__(self, style_dict=None):
-        self._style_dict = deepcopy(Style.DEFAULT_DICT)
+    def __init__(self, style_dict=None, base_dict=None):
+        if not base_dict:
+            base_dict = Style.DEFAULT_DICT
+        self._style_dict = deepcopy(base_dict)
         self.resources = Style.RESOURCES
+        self._variants = WeakValueDictionary()  # frozen change_dict: Style
 
         if style_dict:
-            self.change_dict(style_dict)
+            self.update_dict(style_dict)
+        self.key = self.freeze(self._style_dict)
+
+    @staticmethod
+    def freeze(value):
+        if type(value) == dict:
+            return tuple(
+                (k, Style.freeze(value[k])) for k in sorted(value))
+
+        if type(value) != str and hasattr(value, "__iter__"):
+            return tuple(Style.freeze(v) for v in value)
+
+        return value
+
+    # least recently used styles are dropped past CACHE_SIZE
+    @staticmethod
+    def intern(style):
+        interned = Style.INTERNED
+        key = style.key
+
+        if key in interned:
+            interned.move_to_end(key)
+            return interned[key]
+
+        interned[key] = style
+        if len(interned) > Style.CACHE_SIZE:
+            interned.popitem(last=False)
+
+        return style
+
+    @staticmethod
+    def get_style(style_dict=None):
+        if not Style.DEFAULT:
+            Style.DEFAULT = Style.intern(Style())
+        default = Style.DEFAULT
+
+        if style_dict:
+            return default.change_dict(style_dict)
+        else:
+            return default
 
     def change_dict(self, change_dict):
+        key = self.freeze(change_dict)
+        style = self._variants.get(key)
+
+        if style is None:
+            style = Style.intern(Style(change_dict, self._style_dict))
+            self._variants[key] = style
+
+        return style
+
+    def update_dict(self, change_dict):
         for key in change_dict:
-            item = change_dict[key]
+            item = deepcopy(change_dict[key])
 
             if type(item) == dict:
                 self._style_dict[key].update(item)
@@ -257,7 +332,7 @@ class Style:
 
 class StyleInterface:
     def __init__(self, style_dict=None):
-        self._style = Style(style_dict)
+        self._style = Style.get_style(style_dict)
 
     @property
     def style(self):
@@ -268,4 +343,4 @@ class StyleInterface:
         self.adjust_style(value)
 
     def adjust_style(self, value):
-        self._style.change_dict(value)
+        self._style = self._style.change_dict(value)
@@ -0,0 +1,70 @@
+from zs_src.animations import LeftRightGraphics, StreamManager
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class StreamManagerUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", StreamManager)
+
+        class MockEntity:
+            def __init__(self, name):
+                self.name = name
+
+        def get_graphics(name):
+            return LeftRightGraphics(
+                "squirrel.gif", "squirrel.txt", MockEntity(name),
+                lambda: "right_idle")
+
+        a = StreamManager("squirrel.txt")
+        b = StreamManager("squirrel.txt")
+        assert a.stream_dict is b.stream_dict
+        l("stream dicts shared ok")
+
+        g1, g2 = get_graphics("g1"), get_graphics("g2")
+        assert set(g1.image_sets) == set(g2.image_sets)
+
+        for name in g1.image_sets:
+            s1, s2 = g1.image_sets[name], g2.image_sets[name]
+            assert s1 is not s2
+            assert s1.images is s2.images
+            assert s1._hitboxes is s2._hitboxes
+        l("frames shared ok")
+
+        s1, s2 = g1.image_sets["right_idle"], g2.image_sets["right_idle"]
+        s1.next_frame()
+        assert s1.current_frame == 1 and s2.current_frame == 0
+        s2.reset()
+        assert s1.current_frame == 1
+        l("playback state ok")
+
+        assert not any(n.startswith("left_") for n in g1.image_sets)
+        g1.get_image_state = lambda: "left_idle"
+        left = g1.get_image_set()
+        assert g1.image_sets["left_idle"] is left
+        right = g1.image_sets["right_idle"]
+        assert left.images is not right.images
+        assert left.cell_size == right.cell_size
+
+        image = right.images[0]
+        flipped = left.images[0]
+        w, h = image.get_size()
+        for x in range(w):
+            for y in range(h):
+                assert image.get_at((x, y)) == flipped.get_at((w - 1 - x, y))
+        l("lazy mirror ok")
+
+        g2.get_image_state = lambda: "left_idle"
+        assert g2.get_image_set().images is left.images
+        g2.get_image_state = lambda: "left_missing"
+        assert g2.get_image_set() is None
+        l("shared mirror ok")
+        l("! ")
+
+
+TESTS = StreamManagerUnitTest,
+
+
+def do_tests():
+    for test in TESTS:
+        test().do_tests()
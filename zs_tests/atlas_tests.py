@@ -0,0 +1,114 @@
+from os.path import join
+from threading import Thread
+from time import sleep
+
+import pygame
+
+import zs_src.atlas as atlas_module
+from zs_constants.paths import ANIMATIONS, IMAGES, TILESETS
+from zs_constants.zs import TEXTURE_ATLAS
+from zs_src.atlas import TextureAtlas, get_atlas_image
+from zs_src.graphics import Graphics
+from zs_tests.zs_unit_test import ZsUnitTest, set_up_display
+
+
+class TextureAtlasUnitTest(ZsUnitTest):
+    @staticmethod
+    def get_image(size, color):
+        image = pygame.Surface(size)
+        image.fill(color)
+
+        return image
+
+    def do_tests(self):
+        l = self.log
+        l("!s", TextureAtlas)
+
+        gi = self.get_image
+        images = {
+            "a": gi((30, 20), (255, 0, 0)),
+            "b": gi((50, 10), (0, 255, 0)),
+            "c": gi((40, 40), (0, 0, 255)),
+            "d": gi((90, 90), (255, 255, 255)),
+            "too big": gi((200, 10), (0, 0, 0))
+        }
+        atlas = TextureAtlas("test atlas", page_size=(100, 100))
+        atlas.add_images(images)
+
+        assert "too big" not in atlas
+        assert len(atlas.pages) == 2
+        l("add_images ok")
+
+        rects = [atlas.regions[k][1] for k in "abc"]
+        for r in rects:
+            others = [o for o in rects if o is not r]
+            assert r.collidelist(others) == -1
+        l("regions don't overlap ok")
+
+        for key in "abcd":
+            region = atlas.get_region(key)
+            assert region.get_size() == images[key].get_size()
+            assert region.get_at((0, 0)) == images[key].get_at((0, 0))
+            assert region.get_parent() is atlas.pages[atlas.regions[key][0]]
+        l("get_region ok")
+
+        thread = Thread(target=atlas.convert)
+        thread.start()
+        thread.join()
+        assert not atlas.converted
+        atlas.convert()
+        assert atlas.converted
+        l("converted on main thread only ok")
+
+        builds = []
+
+        def build_atlas(folder):
+            sleep(.05)
+            builds.append(TextureAtlas(folder))
+            return builds[-1]
+
+        real_build = atlas_module.build_atlas
+        real_atlases = atlas_module.ATLASES
+        atlas_module.build_atlas, atlas_module.ATLASES = build_atlas, {}
+        try:
+            threads = [Thread(target=atlas_module.get_atlas)
+                       for i in range(4)]
+            for thread in threads:
+                thread.start()
+            assert atlas_module.get_atlas() is builds[0]
+            for thread in threads:
+                thread.join()
+            assert len(builds) == 1
+            l("get_atlas built once ok")
+
+            builds.clear()
+            atlas_module.ATLASES.clear()
+            get_atlas_image(join(ANIMATIONS, "squirrelsheet.gif"))
+            assert not builds
+            if TEXTURE_ATLAS:
+                get_atlas_image(join(IMAGES, "corner.png"))
+                assert [a.name for a in builds] == [IMAGES]
+            l("built per folder on first lookup ok")
+        finally:
+            atlas_module.build_atlas = real_build
+            atlas_module.ATLASES = real_atlases
+
+        sheet = Graphics.load_image(ANIMATIONS, "squirrelsheet.gif")
+        tiles = Graphics.load_image(TILESETS, "treemid.gif")
+        for image in (sheet, tiles):
+            assert image.get_parent() is None
+            assert image.get_flags() & pygame.RLEACCELOK
+            assert not image.get_flags() & pygame.SRCALPHA
+        assert get_atlas_image(join(ANIMATIONS, "squirrelsheet.gif")) is None
+        l("sheets and tilesets not packed ok")
+        l("! ")
+
+
+TESTS = TextureAtlasUnitTest,
+
+
+def do_tests():
+    set_up_display()
+
+    for test in TESTS:
+        test().do_tests()
@@ -0,0 +1,141 @@
+from time import perf_counter, sleep
+
+import pygame
+
+from launch_environment import get_environment
+from zs_constants.zs import SCREEN_SIZE, CONTROLLERS
+from zs_src.controller import InputManager
+from zs_src.game import Game
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class ZsBenchmark(ZsUnitTest):
+    """
+    Benchmarks use the same logging interface as the unit tests but
+    report timings instead of asserting on results. Each benchmark's
+    do_benchmarks() method returns a dict of the measured values so that
+    they can be compared between runs.
+    """
+    @staticmethod
+    def time_calls(function, n):
+        start = perf_counter()
+        for x in range(n):
+            function()
+
+        return (perf_counter() - start) / n
+
+    def log_time(self, name, seconds):
+        self.log("{:>36}: {:8.3f} ms".format(name, seconds * 1000))
+
+    def log_change(self, name, before, after):
+        change = (before - after) / before
+        self.log("{:>36}: {:8.1%}".format(name, change))
+
+
+class GameBenchmark(ZsBenchmark):
+    ENVIRONMENT = "sprite_demo"
+    FRAMES = 300
+    WARM_UP = 30
+
+    # pygame.display.flip() only blocks for vsync on a real display,
+    # so the benchmark can wrap it with a fixed delay to approximate that
+    @staticmethod
+    def get_blocking_flip(flip, delay):
+        def blocking_flip():
+            sleep(delay)
+            flip()
+
+        return blocking_flip
+
+    def get_game(self, screen):
+        env = get_environment(self.ENVIRONMENT)
+        game = Game(env, screen, InputManager(*CONTROLLERS), 0)
+        game.environment.handle_event("spawn")
+
+        return game
+
+    def time_game(self, screen, frames):
+        game = self.get_game(screen)
+
+        def frame():
+            pygame.event.pump()
+            game.controllers[0].update()
+            game.present_frame()
+
+        self.time_calls(frame, self.WARM_UP)
+
+        return self.time_calls(frame, frames)
+
+    def do_benchmarks(self, frames=FRAMES, vsync_delays=(0, .004, .008)):
+        l = self.log
+        l("!h FRAME TIME BENCHMARK")
+
+        screen = pygame.display.set_mode(SCREEN_SIZE)
+        flip = pygame.display.flip
+        results = {}
+
+        for delay in vsync_delays:
+            pygame.display.flip = self.get_blocking_flip(flip, delay)
+            results[delay] = self.time_game(screen, frames)
+
+            l("!u flip delay {} ms, {} frames".format(
+                delay * 1000, frames))
+            self.log_time("frame time", results[delay])
+            l("")
+
+        pygame.display.flip = flip
+        l("! ")
+
+        return results
+
+
+class MenuBenchmark(ZsBenchmark):
+    OPTIONS = 500
+    RUNS = 5
+
+    @staticmethod
+    def make_menu(n):
+        from zs_src.sprites.menus_gui import OptionBlock, TextOption
+
+        members = [TextOption("option {}".format(i)) for i in range(n)]
+
+        return OptionBlock("benchmark block", members=members)
+
+    @staticmethod
+    def make_styles(n):
+        from zs_src.style import StyleInterface
+
+        for i in range(n):
+            si = StyleInterface()
+            si.style = {"colors": {"text": (0, 200, 0)}}
+
+    def do_benchmarks(self, n=OPTIONS, runs=RUNS):
+        l = self.log
+        l("!h MENU CONSTRUCTION BENCHMARK")
+
+        pygame.display.set_mode(SCREEN_SIZE)
+        results = {
+            "menu": self.time_calls(lambda: self.make_menu(n), runs),
+            "styles": self.time_calls(lambda: self.make_styles(n), runs)
+        }
+
+        l("!u {} options, {} runs".format(n, runs))
+        self.log_time("option block construction", results["menu"])
+        self.log_time("style construction", results["styles"])
+        l("! ")
+
+        return results
+
+
+BENCHMARKS = GameBenchmark, MenuBenchmark
+
+
+def do_benchmarks():
+    pygame.init()
+
+    for benchmark in BENCHMARKS:
+        benchmark().do_benchmarks()
+
+
+if __name__ == "__main__":
+    do_benchmarks()
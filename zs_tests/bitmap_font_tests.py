@@ -0,0 +1,52 @@
+import pygame
+
+from zs_src.bitmap_font import BitmapFont
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class BitmapFontUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", BitmapFont)
+
+        pygame.font.init()
+        font = pygame.font.Font(None, 20)
+        bf = BitmapFont(font)
+        color = 255, 255, 0
+
+        for text in ("", " ", "a", "HUD: (1.0, -3.5)"):
+            image = bf.render(text, True, color)
+            assert image.get_size() == bf.size(text)
+            assert image.get_height() == font.get_height()
+        l("size ok")
+
+        assert bf.size(" ") == font.size(" ")
+        assert bf.render(" ", 1, (0, 0, 0)).get_size() == font.size(" ")
+        l("char size ok")
+
+        image = bf.render("A", True, color)
+        direct = font.render("A", True, color)
+        for x in range(image.get_width()):
+            for y in range(image.get_height()):
+                assert image.get_at((x, y)).a == direct.get_at((x, y)).a
+        l("glyph image ok")
+
+        assert not bf.can_render("café")
+        assert bf.size("café") == font.size("café")
+        l("fallback ok")
+
+        bf = BitmapFont(font)
+        bf.render("a", True, color)
+        bf.render("b", True, color)
+        bf.render("c", False, color)
+        assert len(bf._atlases) == 2
+        l("tinted atlases ok")
+        l("! ")
+
+
+TESTS = BitmapFontUnitTest,
+
+
+def do_tests():
+    for test in TESTS:
+        test().do_tests()
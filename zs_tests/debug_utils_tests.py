@@ -0,0 +1,137 @@
+from zs_src.entities import Layer
+from zs_src.profiler import get_profiler
+from zs_tests.zs_unit_test import ZsUnitTest, set_up_display
+from zs_utils.debug_utils import (
+    DebugLayer, HudField, HudSampler, ListEditor)
+
+
+class HudSamplerUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", HudSampler)
+
+        class MockField:
+            def __init__(self):
+                self.samples = 0
+
+            def sample(self):
+                self.samples += 1
+
+        fields = [MockField() for i in range(12)]
+        sampler = HudSampler("test sampler", 4)
+        for field in fields:
+            sampler.add_field(field)
+
+        counts = []
+        for frame in range(8):
+            before = sum(f.samples for f in fields)
+            sampler.update()
+            counts.append(sum(f.samples for f in fields) - before)
+        assert counts == [3] * 8
+        assert all(f.samples == 2 for f in fields)
+        l("spread ok")
+
+        sampler.spread = False
+        sampler.frame = 0
+        counts = []
+        for frame in range(8):
+            before = sum(f.samples for f in fields)
+            sampler.update()
+            counts.append(sum(f.samples for f in fields) - before)
+        assert counts == [12, 0, 0, 0, 12, 0, 0, 0]
+        l("aligned ok")
+
+        sampler.remove_field(fields[0])
+        assert len(sampler.fields) == 11
+        l("remove_field ok")
+
+        field = HudField(None, ("a", lambda o: 1), sampler=sampler)
+        assert field in sampler.fields
+        sampler.add_field(field)
+        assert len(sampler.fields) == 12
+        field.handle_event("death")
+        assert field not in sampler.fields
+        field.handle_event("spawn")
+        assert field in sampler.fields
+        field.kill()
+        assert field not in sampler.fields
+        l("dead fields removed ok")
+        l("! ")
+
+
+class DebugLayerUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", DebugLayer)
+
+        profiler = get_profiler()
+        profiler.set_enabled(False)
+        debug = DebugLayer(Layer("test environment"))
+        debug.update()
+        assert debug.profiler_box is None
+        assert not debug.hud_table.member_list
+        assert not debug.sampler.fields
+        l("no profiler box while disabled ok")
+
+        profiler.set_enabled(True)
+        debug.update()
+        box = debug.profiler_box
+        assert debug.hud_table.member_list == [box]
+        assert len(debug.sampler.fields) == DebugLayer.PROFILER_ROWS
+        debug.update()
+        assert debug.profiler_box is box
+        l("profiler box shown ok")
+
+        profiler.set_enabled(False)
+        debug.update()
+        assert debug.profiler_box is None
+        assert not debug.hud_table.member_list
+        assert not debug.sampler.fields
+        l("profiler box removed ok")
+
+        other = debug.add_hud_box("other", profiler, [("a", lambda p: 1)])
+        profiler.set_enabled(True)
+        debug.update()
+        profiler.set_enabled(False)
+        debug.update()
+        assert debug.hud_table.member_list == [other]
+        assert other.groups == [debug.hud_group]
+        assert len(debug.sampler.fields) == 1
+        l("other boxes kept ok")
+        l("! ")
+
+
+class ListEditorUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", ListEditor)
+
+        editor = ListEditor(
+            "test editor", model={str(i): i for i in range(500)})
+        editor.handle_event("spawn")
+        mb = editor.main_block
+        options = mb.option_list
+        assert len(options) == mb.window_size
+        assert all(o.child for o in options)
+        l("only window options made ok")
+
+        for i in range(20):
+            mb.cycle_pointer((0, 1))
+        ao = mb.active_option
+        editor.model.handle_change("_value_names")
+        assert mb.pointer == [20, 0]
+        assert mb.active_option is not ao
+        assert mb.active_option.text == ao.text
+        assert mb.active_option.child
+        l("options made again in place ok")
+        l("! ")
+
+
+TESTS = HudSamplerUnitTest, DebugLayerUnitTest, ListEditorUnitTest
+
+
+def do_tests():
+    set_up_display()
+
+    for test in TESTS:
+        test().do_tests()
@@ -1,9 +1,12 @@
 from random import randint, seed
 
+import pygame
 from pygame.sprite import Group
 
 from zs_constants.zs import TRANSITION_TIME
-from zs_src.entities import Entity, Sprite, Layer
+from zs_src.classes import RenderQueue
+from zs_src.entities import Entity, Sprite, Layer, Model
+from zs_src.layers.menus import HeadsUpDisplay
 from zs_tests.zs_unit_test import ZsUnitTest
 
 
@@ -328,7 +331,193 @@ class LayerUnitTest(ZsUnitTest):
         l("reset_spawn ok")
         l("! ")
 
-TESTS = ZsEntityUnitTest, ZsSpriteUnitTest, LayerUnitTest
+
+class ModelUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", Model)
+
+        model = Model("test model", {"b": 1})
+        calls = []
+
+        def get_visible(e):
+            calls.append(e)
+
+            return e.visible
+
+        entities = [Entity("entity {}".format(i)) for i in range(10)]
+        for e in entities:
+            model.link_object(e, "_" + e.name, get_visible)
+        assert len(calls) == 10
+        assert model.values["_entity 3"] is True
+
+        model.update()
+        assert len(calls) == 10
+        l("unchanged objects not checked ok")
+
+        entities[3].visible = False
+        entities[3].visible = True
+        entities[3].visible = False
+        assert model.values["_entity 3"] is True
+        model.update()
+        assert len(calls) == 11
+        assert model.values["_entity 3"] is False
+        l("changed object checked once ok")
+
+        entities[5].position = 10, 10
+        model.update()
+        assert calls[-1] is entities[5]
+        l("position change ok")
+
+        polled = []
+        model.link_object(
+            entities[0], "_polled", lambda e: polled.append(e) or 1,
+            poll=True)
+        model.update()
+        model.update()
+        assert len(polled) == 3
+        l("poll ok")
+
+        tools = HeadsUpDisplay("test hud").tools
+        e = entities[1]
+        reporter = tools.make_reporter_sprite(e, fields=("visible", "active"))
+        assert reporter.text == "visible: True, active: True"
+        assert not tools.model.object_listeners
+        e.visible = False
+        tools.model.update()
+        assert reporter.text == "visible: False, active: True"
+        l("field reporter ok")
+
+        tools.make_reporter_sprite(e, lambda o: o.name)
+        assert len(tools.model.object_listeners) == 1
+        try:
+            tools.make_reporter_sprite(e, fields=("name",))
+            assert False
+        except ValueError:
+            l("polled reporter ok")
+
+        model.set_value("a", 0)
+        model.update()
+        assert model.values["_value_names"] == ["a", "b"]
+        l("value names ok")
+
+        model.clear_object_link(entities[3])
+        entities[3].visible = True
+        model.update()
+        assert model.values["_entity 3"] is False
+        l("clear_object_link ok")
+
+        changes = []
+        model.link_value("a", changes.append)
+        model.link_value("b", changes.append)
+        with model.batch():
+            for i in range(10):
+                model.set_value("a", i)
+            with model.batch():
+                model.set_value("b", "inner")
+            assert changes == []
+            model.set_value("b", "outer")
+        assert changes == [9, "outer"]
+        l("batch ok")
+
+        changes.clear()
+        with model.batch():
+            model.handle_event(("set_value_to", ("value_name", "a"),
+                                ("value", 20), ("ignore", True)))
+        assert changes == [] and model.values["a"] == 20
+        try:
+            with model.batch():
+                model.set_value("a", 30)
+                raise ValueError
+        except ValueError:
+            pass
+        assert changes == [30] and not model.batch_depth
+        l("batch ignore and error ok")
+        l("! ")
+
+
+class RenderQueueUnitTest(ZsUnitTest):
+    class MockItem:
+        def __init__(self, name, position, color, size=(4, 4)):
+            self.name = name
+            self.position = position
+            self.size = size
+            self.visible = True
+
+            self.image = pygame.Surface(size)
+            self.image.fill(color)
+
+        def __repr__(self):
+            return self.name
+
+    class MockGraphics:
+        def __init__(self, rect, color):
+            self.rect = rect
+            self.color = color
+
+        def draw(self, screen, offset=(0, 0)):
+            screen.fill(self.color, self.rect)
+
+    def do_tests(self):
+        l = self.log
+        l("!s", RenderQueue)
+
+        red, green, blue, grey = (
+            (255, 0, 0), (0, 255, 0), (0, 0, 255), (50, 50, 50))
+        mi = self.MockItem
+
+        root = Layer("root", size=(100, 100))
+        sub = Layer("sub", size=(50, 50), position=(20, 30))
+        root.add_sub_layer(sub)
+        sub.graphics = self.MockGraphics(
+            pygame.Rect(20, 30, 50, 50), grey)
+
+        a = mi("a", (20, 30), red)
+        b = mi("b", (0, 0), green)
+        c = mi("c", (10, 10), blue)
+        d = mi("d", (48, 10), green)
+        root.groups = [[a]]
+        sub.groups = [[b, c, d]]
+
+        queue = RenderQueue("test render queue")
+        root.set_render_queue(queue)
+        queue.set_root(sub)
+        assert queue.root is root and sub.render_queue is queue
+        l("set_root ok")
+
+        screen = pygame.Surface((100, 100))
+        root.draw(screen)
+        assert list(queue) == [b, c, d, a]
+        assert screen.get_at((30, 40)) == blue
+        assert screen.get_at((21, 31)) == red
+        l("sub layer offset ok")
+        assert screen.get_at((69, 40)) == green
+        assert screen.get_at((70, 40)) == (0, 0, 0)
+        l("sub layer clipping ok")
+        assert screen.get_at((60, 60)) == grey
+        l("drawn over backgrounds ok")
+
+        c.position = 10, 40
+        sub.groups = [[c, d]]
+        root.draw(screen)
+        assert list(queue) == [d, a, c]
+        l("sort changed key ok")
+
+        sub.visible = False
+        a.visible = False
+        screen.fill((0, 0, 0))
+        root.draw(screen)
+        assert list(queue) == [a] and screen.get_at((21, 31)) == (0, 0, 0)
+        l("visible ok")
+        l("! ")
+
+
+# the entity tests predate the current Entity API and fail, so they go
+# last to keep them from stopping the rest of the module
+TESTS = (
+    ModelUnitTest, RenderQueueUnitTest,
+    ZsEntityUnitTest, ZsSpriteUnitTest, LayerUnitTest
+)
 
 
 def do_tests():
@@ -1,5 +1,9 @@
+from threading import Event
+
+import pygame
+
 from zs_tests.zs_unit_test import ZsUnitTest
-from zs_src.game import Game
+from zs_src.game import Game, EnvironmentLoader
 
 
 class GameUnitTest(ZsUnitTest):
@@ -61,6 +65,89 @@ class GameUnitTest(ZsUnitTest):
         l("! ")
 
 
+class EnvironmentLoaderUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", EnvironmentLoader)
+
+        class MockInputManager:
+            @staticmethod
+            def get_controllers():
+                return []
+
+        class MockEnvironment:
+            def __init__(self, name):
+                self.name = name
+                self.values = {}
+                self.transition_to = None
+                self.preload_to = None
+                self.game_environment = False
+                self.controllers = []
+
+                self.release = Event()
+                self.prepared = False
+                self.spawned = False
+
+            def prepare(self):
+                self.release.wait()
+                self.prepared = True
+
+            def handle_event(self, event):
+                self.spawned = event == "spawn"
+
+            def get_value(self, name):
+                return self.values.get(name)
+
+            def set_value(self, name, value):
+                self.values[name] = value
+
+            def main(self, screen):
+                pass
+
+        g = Game(lambda: MockEnvironment("start"), pygame.Surface((1, 1)),
+                 MockInputManager(), 60)
+        start = g.environment
+
+        t = MockEnvironment("next")
+        start.preload_to = t
+        start.transition_to = t
+        g.main_routine()
+        loader = g.loaders[t]
+        assert g.environment is start and not t.spawned
+        assert start.preload_to is None
+        l("waits for loader ok")
+
+        t.release.set()
+        loader.wait()
+        assert loader.done and t.prepared
+        g.change_environment(t)
+        assert g.environment is t and t.spawned
+        assert not g.loaders
+        assert g.transition_times[-1][0::2] == ("next", True)
+        l("preloaded transition ok")
+
+        u = MockEnvironment("sync")
+        u.prepare = None
+        g.change_environment(u)
+        assert g.environment is u and u.spawned
+        assert g.transition_times[-1][0::2] == ("sync", False)
+        l("synchronous transition ok")
+
+        v = MockEnvironment("error")
+        v.prepare = lambda: 1 / 0
+        g.preload_environment(v).wait()
+        assert isinstance(g.loaders[v].error, ZeroDivisionError)
+        g.change_environment(v)
+        assert g.environment is v
+        assert g.transition_times[-1][0::2] == ("error", False)
+        l("loader error ok")
+
+        l("! ")
+
+
+# the Game tests predate the current Game constructor and fail, so they go
+# last to keep them from stopping the rest of the module
 def do_tests():
+    EnvironmentLoaderUnitTest().do_tests()
     GameUnitTest().do_tests()
 
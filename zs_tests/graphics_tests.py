@@ -1,5 +1,7 @@
-from zs_tests.zs_unit_test import ZsUnitTest
-from zs_src.graphics import ImageSet, Graphics
+import pygame
+
+from zs_tests.zs_unit_test import ZsUnitTest, set_up_display
+from zs_src.graphics import ImageSet, Graphics, TextGraphics, ContainerGraphics
 
 
 class ImageSetUnitTest(ZsUnitTest):
@@ -79,9 +81,81 @@ class GraphicsUnitTest(ZsUnitTest):
         l("update ok")
         l("! ")
 
-TESTS = ImageSetUnitTest, GraphicsUnitTest
+
+class TextGraphicsUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", TextGraphics)
+
+        pygame.font.init()
+        font = pygame.font.Font(None, 20)
+        color = 255, 255, 255
+        mti = TextGraphics.make_text_image
+
+        text = ["first line", "second line"]
+        image = mti(text, 0, True, 2, font, color)
+        assert text == ["first line", "second line"]
+        assert mti(list(text), 0, True, 2, font, color) is image
+        assert mti(text, 0, True, 4, font, color) is not image
+        assert mti(text, 0, True, 2, font, (0, 0, 0)) is not image
+        l("make_text_image cache ok")
+
+        lines = TextGraphics.LINE_CACHE
+        hits = lines.hits
+        mti(["first line"], 0, True, 2, font, color)
+        assert lines.hits == hits + 1
+        l("render_line cache ok")
+
+        w, h = font.size("second line")
+        assert image.get_size() == (w, (h * 2) + 2)
+        l("text image size ok")
+        l("! ")
+
+
+class ContainerGraphicsUnitTest(ZsUnitTest):
+    def do_tests(self):
+        from zs_src.sprites.gui import ContainerSprite
+
+        l = self.log
+        l("!s", ContainerGraphics)
+
+        a = ContainerSprite("a", size=(100, 50))
+        b = ContainerSprite("b", size=(100, 50))
+        c = ContainerSprite("c", size=(120, 50))
+        assert a.image is b.image
+        assert a.image is not c.image
+        l("image cache ok")
+
+        b.style = {"border_corners": "ab"}
+        b.graphics.reset_image()
+        assert a.image is not b.image
+        l("style signature ok")
+
+        corner = a.style.border_images[2]
+        get_corner = ContainerGraphics.get_corner
+        assert get_corner(corner, "d") is get_corner(corner, "d")
+        l("get_corner ok")
+
+        image = a.graphics.get_image()
+        a.graphics.set_fade(0.5)
+        faded = a.image
+        assert faded is not image and faded.get_alpha() == 128
+        assert image.get_alpha() in (None, 255)
+        a.graphics.set_fade(0.25)
+        assert a.image is faded and faded.get_alpha() == 64
+        a.graphics.set_fade(None)
+        assert a.image is image
+        l("fade ok")
+        l("! ")
+
+
+# the ImageSet and Graphics tests predate the current API and fail, so they
+# go last to keep them from stopping the rest of the module
+TESTS = (TextGraphicsUnitTest, ContainerGraphicsUnitTest,
+         ImageSetUnitTest, GraphicsUnitTest)
 
 
 def do_tests():
+    set_up_display()
     for test in TESTS:
         test().do_tests()
@@ -0,0 +1,146 @@
+from gc import collect
+
+from zs_constants.style import L, C, T
+from zs_src.entities import Layer, get_layout_queue
+from zs_src.sprites.gui import (
+    ContainerSprite, GuimtColumn, GuimtCutoff, TextSprite)
+from zs_tests.zs_unit_test import ZsUnitTest, set_up_display
+
+
+class GuiMemberTableUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", GuimtColumn)
+
+        class MockMember:
+            def __init__(self, size):
+                self._size = size
+                self.position = 0, 0
+                self.reads = 0
+
+            @property
+            def size(self):
+                self.reads += 1
+                return self._size
+
+        members = [MockMember((10 * i, 5)) for i in range(1, 5)]
+        table = GuimtColumn("test column", members)
+        buffers = 2, 3
+
+        assert table.get_minimum_body_size(buffers) == (40, 29)
+        assert all(m.reads == 1 for m in members)
+        assert table.get_minimum_body_size(buffers) == (40, 29)
+        assert all(m.reads == 1 for m in members)
+        l("cached measurements ok")
+
+        members[1]._size = 50, 10
+        assert table.get_minimum_body_size(buffers) == (40, 29)
+        table.mark_dirty(members[1])
+        assert table.get_minimum_body_size(buffers) == (50, 34)
+        assert [m.reads for m in members] == [1, 2, 1, 1]
+        l("dirty rows ok")
+
+        new = MockMember((5, 5))
+        table.add_member(new)
+        assert table.get_minimum_body_size(buffers) == (50, 42)
+        assert [m.reads for m in members] == [1, 2, 1, 1]
+        table.mark_dirty()
+        table.get_minimum_body_size(buffers)
+        assert [m.reads for m in members] == [2, 3, 2, 2]
+        l("table changes ok")
+
+        table.set_member_positions(
+            (100, 200), (80, 60), (1, 1), buffers, (L, T))
+        ys = [m.position[1] for m in members + [new]]
+        assert [m.position[0] for m in members] == [103] * 4
+        assert ys == [204, 212, 225, 233, 241]
+        l("positions ok")
+
+        grid = GuimtCutoff("test grid", 2, [
+            MockMember((10, 10)) for i in range(4)])
+        size = grid.adjust_size((1, 1), (0, 0), (0, 0))
+        assert size == (20, 20)
+        grid.set_member_positions((0, 0), size, (0, 0), (0, 0), (C, C))
+        assert [m.position for m in grid.member_list] == [
+            (0, 0), (10, 0), (0, 10), (10, 10)]
+        l("grid ok")
+        l("! ")
+
+
+class ContainerSpriteUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", ContainerSprite)
+
+        queue = get_layout_queue()
+        queue.update_layouts()
+
+        group = Layer.Group()
+        outer = ContainerSprite("outer")
+        inner = ContainerSprite("inner")
+        outer.add_member_sprite(inner)
+        outer.add(group)
+        queue.update_layouts()
+        assert not queue
+        size = outer.rect.size
+
+        members = [TextSprite("member {}".format(i)) for i in range(5)]
+        for sprite in members:
+            inner.add_member_sprite(sprite)
+        assert inner.layout_pending and outer.layout_pending
+        assert len(queue) == 2
+        assert outer.rect.size == size
+        l("layout deferred ok")
+
+        queue.update_layouts()
+        assert not queue
+        assert not inner.layout_pending and not outer.layout_pending
+        assert outer.rect.size[1] > size[1]
+        ys = [sprite.position[1] for sprite in members]
+        assert ys == sorted(ys) and len(set(ys)) == len(ys)
+        l("layout update ok")
+
+        height = outer.rect.size[1]
+        inner.remove_member_row(0)
+        assert inner in queue
+        assert outer.size[1] < height
+        assert inner not in queue and outer not in queue
+        l("flush on read ok")
+
+        unspawned = ContainerSprite("unspawned")
+        unspawned.add_member_sprite(TextSprite("member"))
+        assert unspawned.layout_pending and unspawned not in queue
+        unspawned.add(group)
+        assert unspawned in queue
+        queue.update_layouts()
+        assert not unspawned.layout_pending
+        l("unspawned containers not queued ok")
+
+        inner.add_member_sprite(TextSprite("member"))
+        assert inner in queue and outer in queue
+        inner.kill()
+        assert inner not in queue and outer in queue
+        outer.kill()
+        assert not queue
+        l("killed containers dropped ok")
+
+        dropped = ContainerSprite("dropped")
+        dropped.add(group)
+        dropped.invalidate_layout()
+        assert dropped in queue
+        group.remove(dropped)
+        del dropped
+        collect()
+        assert not queue
+        l("weak entries ok")
+        l("! ")
+
+
+TESTS = GuiMemberTableUnitTest, ContainerSpriteUnitTest
+
+
+def do_tests():
+    set_up_display()
+
+    for test in TESTS:
+        test().do_tests()
@@ -0,0 +1,111 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+
+import pygame
+
+from zs_src.asset_loader import AssetLoader
+from zs_src.image_cache import ImageCache, AUTO, get_content_key
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class ImageCacheUnitTest(ZsUnitTest):
+    @staticmethod
+    def save_image(folder, name, size, color):
+        image = pygame.Surface(size)
+        image.fill(color)
+        path = join(folder, name)
+        pygame.image.save(image, path)
+
+        return path
+
+    def do_tests(self):
+        l = self.log
+        l("!s", ImageCache)
+
+        with TemporaryDirectory() as folder:
+            si = self.save_image
+            a = si(folder, "a.bmp", (10, 10), (255, 0, 0))
+            b = si(folder, "b.bmp", (10, 10), (0, 255, 0))
+            c = si(folder, "c.bmp", (20, 20), (0, 0, 255))
+
+            cache = ImageCache("test cache")
+            image = cache.get_image(a)
+            assert cache.get_image(a) is image
+            assert cache.get_image(a, colorkey=True) is not image
+            assert cache.get_image(a, colorkey=True).get_colorkey()
+            assert (cache.hits, cache.misses) == (2, 2)
+            l("get_image ok")
+
+            cache.clear()
+            size = ImageCache.get_surface_size(image)
+            cache.set_budget(size * 2)
+            cache.get_image(a)
+            cache.get_image(b)
+            cache.get_image(a)
+            cache.get_image(c)
+            assert (a, False, AUTO) not in cache
+            assert (b, False, AUTO) not in cache
+            assert (c, False, AUTO) in cache
+            assert cache.evictions == 2
+            l("lru eviction ok")
+
+            stats = cache.get_stats()
+            assert stats["surfaces"] == 1
+            assert stats["size"] == cache.size
+            l("get_stats ok")
+
+            if pygame.display.get_surface():
+                cache.clear()
+                image = cache.get_image(a, colorkey=True)
+                assert image.get_flags() & pygame.RLEACCELOK
+                assert not cache.get_stats()["deferred"]
+            else:
+                cache.clear()
+                cache.get_image(a, colorkey=True)
+                assert cache.get_stats()["deferred"] == 1
+            l("convert images ok")
+
+            cache.clear()
+            cache.set_budget(ImageCache.BUDGET)
+            calls = []
+            n = cache.preload([a, b, c, a], progress=lambda *p: calls.append(p))
+            assert n == 3
+            assert calls[-1] == (3, 3) and len(calls) == 3
+            misses = cache.misses
+            cache.get_image(b)
+            assert cache.misses == misses
+            assert cache.preload([a, b]) == 0
+            l("preload ok")
+
+            serial = AssetLoader(threads=1).load_images([a, b, c])
+            parallel = AssetLoader(threads=4).load_images([a, b, c])
+            for path in (a, b, c):
+                assert get_content_key(serial[path]) == get_content_key(
+                    parallel[path])
+            l("asset loader ok")
+
+            try:
+                cache.get_image(a, convert="bad")
+                assert False
+            except ValueError:
+                l("bad convert mode ok")
+
+        red = pygame.Surface((4, 4))
+        red.fill((255, 0, 0))
+        same = red.copy()
+        blue = pygame.Surface((4, 4))
+        blue.fill((0, 0, 255))
+        assert get_content_key(red) == get_content_key(same)
+        assert get_content_key(red) != get_content_key(blue)
+        same.set_colorkey((255, 0, 0))
+        assert get_content_key(red) != get_content_key(same.copy())
+        l("get_content_key ok")
+        l("! ")
+
+
+TESTS = ImageCacheUnitTest,
+
+
+def do_tests():
+    for test in TESTS:
+        test().do_tests()
@@ -0,0 +1,101 @@
+from zs_src.entities import Layer
+from zs_src.sprites.menus_gui import ScrollingOptionBlock, TextOption
+from zs_tests.zs_unit_test import ZsUnitTest, set_up_display
+
+
+class ScrollingOptionBlockUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", ScrollingOptionBlock)
+
+        calls = {"get": 0, "set": 0}
+
+        def get_option(item):
+            calls["get"] += 1
+
+            return TextOption(str(item))
+
+        def set_option(option, item):
+            calls["set"] += 1
+            option.change_text(str(item))
+
+        group = Layer.Group()
+        block = ScrollingOptionBlock(
+            "test block", range(1000), get_option, set_option,
+            window_size=5, margin=1)
+        assert calls["get"] == 0 and not block.member_list
+        assert block.active_option is None
+        l("lazy window ok")
+
+        block.add(group)
+        assert block.active_option.text == "0"
+        assert calls["get"] == 6
+        assert [o.text for o in block.member_list] == list("01234")
+        assert all(group in o.groups for o in block.member_list)
+        l("window ok")
+
+        for i in range(4):
+            block.cycle_pointer((0, 1))
+        kept = {o: o.groups for o in block.member_list[1:]}
+        block.cycle_pointer((0, 1))
+        assert block.active_option.text == "5"
+        assert block.window == (1, 6)
+        assert [o.text for o in block.member_list] == list("12345")
+        assert all(o.groups is kept[o] for o in block.member_list[:4])
+        assert all(group in o.groups for o in block.member_list)
+        l("scroll down ok")
+
+        block.pointer = [0, 0]
+        last = block.active_option
+        assert last.text == "0" and block.window == (1, 6)
+        block.cycle_pointer((0, -1))
+        current = block.active_option
+        assert current.text == "999" and current is not last
+        assert block.window == (995, 1000)
+        assert calls == {"get": 13, "set": 0}
+        l("wrap ok")
+
+        for i in range(6):
+            block.cycle_pointer((0, -1))
+        assert block.active_option.text == "993"
+        assert block.window == (993, 998)
+        assert calls == {"get": 14, "set": 1}
+        l("recycle ok")
+
+        current = block.active_option
+        block.cycle_pointer((1, 0))
+        assert block.active_option is current
+        block.set_items(["a", "b"])
+        assert block.active_option.text == "a"
+        assert len(block.member_list) == 2
+        l("set_items ok")
+
+        def get_labelled_option(item):
+            option = TextOption(str(item))
+            option.selectable = item % 3 != 0
+
+            return option
+
+        block = ScrollingOptionBlock(
+            "labelled block", range(7), get_labelled_option,
+            window_size=3, margin=1, lazy=False)
+        assert block.pointer == [1, 0] and block.pointer_origin == [0, 0]
+        assert block.active_option.text == "1"
+        block.cycle_pointer((0, 1))
+        block.cycle_pointer((0, 1))
+        assert block.active_option.text == "4"
+        block.pointer = [1, 0]
+        block.cycle_pointer((0, -1))
+        assert block.active_option.text == "5"
+        l("selectable ok")
+        l("! ")
+
+
+TESTS = ScrollingOptionBlockUnitTest,
+
+
+def do_tests():
+    set_up_display()
+
+    for test in TESTS:
+        test().do_tests()
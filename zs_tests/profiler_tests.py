@@ -0,0 +1,166 @@
+import json
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from zs_src.entities import Layer
+from zs_src.profiler import (
+    FrameProfiler, FrameRecorder, ProfileCapture, get_profiler,
+    FRAME_START, INPUT_END, UPDATE_END, DRAW_END)
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class FrameProfilerUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", FrameProfiler)
+
+        profiler = FrameProfiler("test profiler", window=4)
+        calls = []
+        assert profiler.call(("a", "b"), calls.append, 1) is None
+        profiler.end_frame()
+        assert calls == [1] and profiler.frames == 0
+        assert not profiler.get_keys()
+        l("disabled ok")
+
+        profiler.toggle()
+        for frame in range(6):
+            profiler.add_time(("layer", "draw"), 0.001 * (frame + 1))
+            profiler.add_time(("layer", "draw"), 0.001)
+            profiler.add_time(("layer", "update"), 0.0005)
+            profiler.end_frame()
+        stats = profiler.get_stats(("layer", "draw"))
+        assert profiler.frames == 6 and stats["frames"] == 4
+        assert round(stats["mean"], 6) == 5.5
+        assert round(stats["p50"], 6) == 5 and round(stats["max"], 6) == 7
+        assert profiler.get_keys() == [("layer", "draw"), ("layer", "update")]
+        assert profiler.get_summary(0).startswith("layer: draw 5.50")
+        assert profiler.get_summary(2) == ""
+        l("rolling stats ok")
+
+        with TemporaryDirectory() as directory:
+            path = join(directory, "frames", "profile.json")
+            profiler.dump(path)
+            file = open(path, "r")
+            data = json.load(file)
+            file.close()
+        assert data["frames"] == 6
+        assert set(data["timers"]) == {"layer: draw", "layer: update"}
+        l("dump ok")
+
+        profiler = get_profiler()
+        profiler.clear()
+        profiler.set_enabled(True)
+        layer = Layer("test layer")
+        layer.update()
+        profiler.end_frame()
+        profiler.set_enabled(False)
+        names = [key for key in profiler.get_keys() if key[0] == layer.name]
+        assert ("test layer", "Layer.update_sub_layers") in names
+        assert len(names) == len(layer.get_update_methods())
+        profiler.clear()
+        l("entity update ok")
+        l("! ")
+
+
+class FrameRecorderUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", FrameRecorder)
+
+        recorder = FrameRecorder("test recorder", frames=3)
+        recorder.mark(FRAME_START)
+        recorder.end_frame()
+        assert recorder.count == 0 and not any(recorder.times)
+        l("disabled ok")
+
+        recorder.set_enabled(True)
+        recorder.mark(DRAW_END)
+        recorder.end_frame()
+        assert recorder.count == 0
+        l("partial frame dropped ok")
+
+        for frame in range(5):
+            for i in FRAME_START, INPUT_END, UPDATE_END, DRAW_END:
+                recorder.mark(i)
+            recorder.end_frame()
+        frames = recorder.get_frames()
+        assert recorder.count == 5 and len(recorder.times) == 4 * 7
+        assert [frame for frame, marks in frames] == [2, 3, 4]
+        assert all(m[FRAME_START] <= m[DRAW_END] for f, m in frames)
+        l("ring buffer ok")
+
+        events = recorder.get_trace()
+        names = [e["name"] for e in events]
+        assert names.count("frame") == 3 and "collision" not in names
+        assert events[0]["ts"] == 0 and events[0]["args"]["frame"] == 2
+        l("trace ok")
+
+        with TemporaryDirectory() as directory:
+            path = join(directory, "frames")
+            recorder.export(path)
+            file = open(path + ".json", "r")
+            data = json.load(file)
+            file.close()
+            file = open(path + ".csv", "r")
+            rows = [line.split(",") for line in file.read().splitlines()]
+            file.close()
+        assert len(data["traceEvents"]) == len(events)
+        assert rows[0] == ["frame", "start", "input", "update",
+                           "collision", "draw", "flip", "total"]
+        assert [row[0] for row in rows[1:]] == ["2", "3", "4"]
+        assert all(row[4] == "" for row in rows[1:])
+        l("export ok")
+        l("! ")
+
+
+class ProfileCaptureUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", ProfileCapture)
+
+        def inner():
+            return sum(range(20000))
+
+        def outer(n):
+            return [inner() for i in range(n)]
+
+        with TemporaryDirectory() as directory:
+            capture = ProfileCapture("test capture", 3, directory)
+            assert capture.call(outer, 1) == [inner()]
+            assert not capture.active and not listdir(directory)
+            l("inactive ok")
+
+            capture.start()
+            capture.start(10)
+            assert capture.remaining == 3
+            for frame in range(3):
+                assert capture.active
+                capture.call(outer, 2)
+            assert not capture.active and capture.captures == 1
+            l("frame count ok")
+
+            path = capture.last_path
+            files = sorted(listdir(directory))
+            name = path[len(directory) + 1:]
+            assert files == [name + ".collapsed.txt", name + ".pstats"]
+
+            file = open(path + ".collapsed.txt", "r")
+            stacks = [line.rsplit(" ", 1) for line in file]
+            file.close()
+            names = [s.split(";") for s, us in stacks]
+            roots = {n[0] for n in names}
+            assert len(roots) == 1 and roots.pop().endswith("(outer)")
+            assert any(n[-2:][0].endswith("(inner)") and "sum" in n[-1]
+                       for n in names)
+            assert all(int(us) > 0 for s, us in stacks)
+            l("output files ok")
+        l("! ")
+
+
+TESTS = FrameProfilerUnitTest, FrameRecorderUnitTest, ProfileCaptureUnitTest
+
+
+def do_tests():
+    for test in TESTS:
+        test().do_tests()
@@ -0,0 +1,70 @@
+from zs_constants.zs import GLOBAL_RESOURCE_DICT
+from zs_src.resource_library import ResourceLibrary, get_resources
+from zs_tests.zs_unit_test import ZsUnitTest
+
+
+class ResourceLibraryUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", ResourceLibrary)
+
+        rl = get_resources(GLOBAL_RESOURCE_DICT)
+        pending = rl.pending
+        assert pending
+        assert not dict.keys(rl)
+        assert all(key in rl for key in pending)
+        l("lazy entries ok")
+
+        assert len(rl) == len(pending)
+        assert rl.keys() == pending and list(rl) == pending
+        assert not dict.keys(rl)
+        l("pending entries enumerated ok")
+
+        name = "bg.png"
+        image = rl[name]
+        assert dict.__contains__(rl, name)
+        assert name not in rl.pending
+        assert rl[name] is image
+        assert name in rl.image_names
+        l("load on first access ok")
+
+        assert rl.get("missing") is None
+        try:
+            rl["missing"]
+            assert False
+        except KeyError:
+            l("missing key ok")
+
+        calls = []
+        rl.warm_up("dev_main", progress=lambda i, n: calls.append((i, n)))
+        assert dict.__contains__(rl, "dev_main")
+        assert calls == [(1, 1)]
+        l("warm_up subset ok")
+
+        try:
+            rl.warm_up("dev_main", "missing")
+            assert False
+        except KeyError as e:
+            assert "missing" in str(e)
+            l("warm_up unknown key ok")
+
+        rl.warm_up()
+        assert not rl.pending
+        l("warm_up ok")
+
+        rl = ResourceLibrary()
+        rl["loaded"] = 0
+        rl.add_loader("pending", rl.__setitem__, "pending", 1)
+        assert len(rl) == 2 and rl.pending == ["pending"]
+        assert rl.values() == [0, 1] and not rl.pending
+        assert rl.items() == [("loaded", 0), ("pending", 1)]
+        l("values load pending entries ok")
+        l("! ")
+
+
+TESTS = ResourceLibraryUnitTest,
+
+
+def do_tests():
+    for test in TESTS:
+        test().do_tests()
@@ -159,3 +159,62 @@ def do_tests():
     for t in TESTS:
         t().do_tests()
 '''
+
+
+class StyleInternUnitTest(ZsUnitTest):
+    def do_tests(self):
+        l = self.log
+        l("!s", Style)
+
+        d = {"colors": {"text": [0, 200, 0]}, "align_h": "c"}
+        a = Style.get_style(d)
+        b = Style.get_style({"align_h": "c", "colors": {"text": [0, 200, 0]}})
+        assert a is b
+        assert Style.get_style() is Style.get_style()
+        assert a is not Style.get_style()
+        l("get_style ok")
+
+        c = a.change_dict({"align_h": "l"})
+        assert a.align_h == "c"
+        assert c.align_h == "l"
+        assert c.colors["text"] == [0, 200, 0]
+        assert a.change_dict({"align_h": "l"}) is c
+        l("change_dict ok")
+
+        d["colors"]["text"][1] = 0
+        assert a.colors["text"] == [0, 200, 0]
+        l("copy on write ok")
+
+        try:
+            a.change_dict({"bg_style": "error"})
+            assert False
+        except ValueError:
+            l("change_dict value error ok")
+
+        si = StyleInterface(d)
+        si.style = {"colors": {"text": [0, 200, 0]}}
+        assert si.style is Style.get_style(
+            {"align_h": "c", "colors": {"text": [0, 200, 0]}})
+        l("style.setter ok")
+
+        size = Style.CACHE_SIZE
+        Style.CACHE_SIZE = 4
+        try:
+            for i in range(20):
+                a.change_dict({"buffers": {"text": [i, i]}})
+            assert len(Style.INTERNED) == 4
+            assert len(a._variants) <= 5
+            assert a.change_dict({"align_h": "l"}).align_h == "l"
+            assert Style.get_style() is Style.DEFAULT
+            l("cache bounded ok")
+        finally:
+            Style.CACHE_SIZE = size
+        l("! ")
+
+
+TESTS = StyleInternUnitTest,
+
+
+def do_tests():
+    for t in TESTS:
+        t().do_tests()
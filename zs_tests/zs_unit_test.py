@@ -1,3 +1,14 @@
+import pygame
+
+
+# tests that convert surfaces or render text need a display mode, which
+# isn't set when a test module is run on its own
+def set_up_display(size=(1, 1)):
+    pygame.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode(size)
+
+
 class ZsUnitTest:
     HR_WIDTH = 60
     MARGIN_LINES = 3
@@ -74,10 +74,11 @@ class SpriteSheetMenu(Menu):
 
     def on_load_animation_editor(self):
         section = self.event.section
+        # stream dicts are shared with every StreamManager
         d = {
             "name": section.name,
-            "stream": section.stream,
-            "hitboxes": section.hitboxes
+            "stream": list(section.stream),
+            "hitboxes": list(section.hitboxes)
         }
 
         layer = AnimationEditor(
@@ -4,6 +4,8 @@ from zs_constants.zs import SCREEN_SIZE
 from zs_src.classes import CacheList
 from zs_src.events import Event
 from zs_src.layers.menus import Menu, HeadsUpDisplay
+from zs_src.profiler import (
+    FRAME_TRACE_PATH, get_frame_recorder, get_profile_capture, get_profiler)
 from zs_src.sprites.gui import ContainerSprite, TextSprite
 from zs_src.sprites.menus_gui import TextFieldOption, SwitchOption, TextOption
 
@@ -130,23 +132,23 @@ class DictEditor(Menu):
 
         self.add_event_methods("load_sub_editor", "update_model")
 
+    # the main block only makes options for the values that scroll into
+    # its window, so a model with thousands of values opens as quickly
+    # as a small one
     def populate(self):
         tools = self.tools
-        mb = tools.make_main_block()
-
-        tools.link_value_to_member_column(
-            mb, "_value_names",
-            self.get_value_option,
-            update=self.get_main_block_update
-        )
+        mb = tools.make_scrolling_main_block(self.get_main_option)
 
-        tools.set_auto_sub_block_trigger(
-            "change_linked_value", mb,
-            self.get_value_sub_block,
+        tools.link_value_to_scrolling_block(mb, "_value_names")
 
-        )
+    # each option gets its sub block when it's made
+    def get_main_option(self, value_name):
+        o = self.get_value_option(value_name)
+        sb = self.get_value_sub_block(o)
+        if sb:
+            self.add_sub_block(self.main_block, sb, o)
 
-        mb.handle_event("change_linked_value")
+        return o
 
     def get_value_option(self, value_name):
         value = self.get_value(value_name)
@@ -163,9 +165,6 @@ class DictEditor(Menu):
 
         return o
 
-    def get_main_block_update(self):
-        return []
-
     def get_value_sub_block(self, option):
         tools = self.tools
         value_name = option.text
@@ -180,11 +179,7 @@ class DictEditor(Menu):
         if type(value) in (MethodType, FunctionType):
             return None
 
-        x, y = option.position
-        x += self.main_block.size[0]
-        sb = tools.OptionBlock(
-            value_name + " sub block",
-            position=(x, y))
+        sb = tools.OptionBlock(value_name + " sub block")
 
         o = self.get_value_editor(value_name)
         sb.add_member_sprite(o)
@@ -193,6 +188,25 @@ class DictEditor(Menu):
 
         return sb
 
+    # options move as the main block scrolls, so a sub block is placed
+    # next to its option when it's shown instead of when it's made
+    def on_show_sub_block(self):
+        block = self.event.block
+        ao = self.main_block.active_option
+
+        if ao and ao.child is block:
+            block.position = self.get_sub_block_position(ao)
+
+        super(DictEditor, self).on_show_sub_block()
+
+    # the main block's size is read first, so that a pending layout
+    # has set the option's position
+    def get_sub_block_position(self, option):
+        w = self.main_block.size[0]
+        x, y = option.position
+
+        return x + w, y
+
     def get_load_editor_option(self, value_name):
         value = self.get_value(value_name)
         tools = self.tools
@@ -298,7 +312,7 @@ class DictEditor(Menu):
             raise ValueError
 
         self.set_value(name, d)
-        self.main_block.handle_event("change_linked_value")
+        self.model.handle_change("_value_names")
 
     # def on_update_dict(self):
     #     d = self.get_return_value()
@@ -331,31 +345,13 @@ class ListEditor(DictEditor):
         return [self.get_value(n) for n in names]
 
     def populate(self):
+        super(ListEditor, self).populate()
         tools = self.tools
-        mb = tools.make_main_block()
-
-        def get_list_option(value_name):
-            o = self.get_value_editor(value_name)
-            o.set_event_conditional(
-                "activate", "not active",
-                "update_sub_blocks", self
-            )
-
-            return o
-
-        tools.link_value_to_member_column(
-            mb, "_value_names",
-            get_list_option
-        )
+        mb = self.main_block
 
         x, y = mb.position
         x += mb.size[0]
 
-        tools.set_auto_sub_block_trigger(
-            "change_linked_value", mb,
-            self.get_value_sub_block
-        )
-
         def get_b_item(s):
             ao = s.main_block.active_option
             if ao.child:
@@ -387,40 +383,58 @@ class ListEditor(DictEditor):
             mb, [a_item, b_item], position=(x, y)
         )
 
-        mb.handle_event("change_linked_value")
+    def get_value_option(self, value_name):
+        o = self.get_value_editor(value_name)
+        o.set_event_conditional(
+            "activate", "not active",
+            "update_sub_blocks", self
+        )
 
+        return o
+
+    # the sub block for each of the N items lists the N - 1 items it can
+    # be swapped with, so it scrolls through them instead of making an
+    # option for each one
     def get_value_sub_block(self, option):
         tools = self.tools
         value_name = option.index
 
-        x, y = option.position
-        x += self.main_block.size[0] + 20
-        y += 20
-        sb = tools.OptionBlock(
-            str(value_name) + " sub block",
-            position=(x, y))
-
         def get_swap(index):
             return ("swap_item",
                     ("a_index", option.index),
                     ("b_index", index))
 
-        for j in range(len(self.model.value_names)):
-            if not j == option.index:
-                j_text = str(self.get_value_at_index(j))
-                if len(j_text) > 25:
-                    j_text = j_text[:22] + "..."
+        def set_swap(swap, j):
+            j_text = str(self.get_value_at_index(j))
+            if len(j_text) > 25:
+                j_text = j_text[:22] + "..."
+
+            swap.change_text("Swap {} with {}".format(
+                option.text, j_text))
+            swap.remove_event_listener("activate")
+            tools.set_activation_event(swap, get_swap(j), self)
+            swap.set_event_listener(
+                "activate", "die", sb, temp=True)
+
+        def make_swap(j):
+            swap = tools.make_text_option("")
+            set_swap(swap, j)
+
+            return swap
 
-                swap = tools.make_text_option(
-                    "Swap {} with {}".format(
-                        option.text, j_text),
-                    get_swap(j), self)
+        indexes = [j for j in range(len(self.model.value_names))
+                   if j != option.index]
+        sb = tools.ScrollingOptionBlock(
+            str(value_name) + " sub block",
+            indexes, make_swap, set_swap)
 
-                sb.add_member_sprite(swap)
-                swap.set_event_listener(
-                    "activate", "die", sb, temp=True)
         return sb
 
+    def get_sub_block_position(self, option):
+        x, y = super(ListEditor, self).get_sub_block_position(option)
+
+        return x + 20, y + 20
+
     def on_swap_item(self):
         i, j = self.event.a_index, \
                self.event.b_index
@@ -436,12 +450,10 @@ class ListEditor(DictEditor):
              ("block", self.main_block))
         )
 
+    # the options are made again so that the swap options show the new
+    # value
     def on_update_sub_blocks(self):
-        self.main_block.handle_event("change_linked_value")
-        self.main_block.active_option.handle_event(
-            ("select",
-             ("no_sound", True))
-        )
+        self.model.handle_change("_value_names")
 
 
 class PauseMenu(Menu):
@@ -498,6 +510,9 @@ class PauseMenu(Menu):
         if in_model("frame_advance"):
             self.add_frame_advance_option(mb)
 
+        self.add_frame_recorder_option(mb)
+        self.add_profile_capture_option(mb)
+
         if in_model("items_dict"):
             self.add_item_options(mb)
 
@@ -529,6 +544,51 @@ class PauseMenu(Menu):
             frame_option, frame_advance)
         mb.add_member_sprite(frame_option)
 
+    # stopping the frame recorder exports the recorded frames
+    def add_frame_recorder_option(self, mb):
+        tools = self.tools
+
+        recorder_option = tools.TextOption(
+            "Record frames"
+        )
+
+        def toggle_recorder():
+            recorder = get_frame_recorder()
+
+            if recorder.enabled:
+                recorder.set_enabled(False)
+                recorder.export()
+                text = "Frames saved to \n {}".format(FRAME_TRACE_PATH)
+
+            else:
+                recorder.set_enabled(True)
+                text = "Recording frames \n Select again to save"
+
+            tools.show_dialog(text, response="die")
+
+        tools.set_function_call_on_activation(
+            recorder_option, toggle_recorder)
+        mb.add_member_sprite(recorder_option)
+
+    def add_profile_capture_option(self, mb):
+        tools = self.tools
+
+        capture_option = tools.TextOption(
+            "Profile frames"
+        )
+
+        def start_capture():
+            capture = get_profile_capture()
+            capture.start()
+            tools.show_dialog(
+                "Profiling the next {} frames \n Saving to {}".format(
+                    capture.remaining, capture.directory),
+                response="die")
+
+        tools.set_function_call_on_activation(
+            capture_option, start_capture)
+        mb.add_member_sprite(capture_option)
+
     def add_item_options(self, mb):
         tools = self.tools
         spawn_option = tools.TextOption(
@@ -702,6 +762,8 @@ class PauseMenu(Menu):
 
 class DebugLayer(HeadsUpDisplay):
     ANIMATION_MACHINE_MAX = 5
+    HUD_INTERVAL = 5
+    PROFILER_ROWS = 5
 
     def __init__(self, environment, **kwargs):
         super(DebugLayer, self).__init__("Debug Layer", **kwargs)
@@ -712,8 +774,13 @@ class DebugLayer(HeadsUpDisplay):
         def toggle_visible():
             self.visible = not self.visible
 
+        profiler = get_profiler()
+        self.profiler = profiler
+        self.profiler_box = None
         self.interface = {
             "Toggle debug layer": toggle_visible,
+            "Toggle frame profiler": profiler.toggle,
+            "Dump frame profile": profiler.dump
         }
 
         w, h = SCREEN_SIZE
@@ -732,25 +799,117 @@ class DebugLayer(HeadsUpDisplay):
         block.add(self.hud_group)
         block.visible = False
         self.hud_table = block
+        self.sampler = HudSampler(
+            "HUD sampler", DebugLayer.HUD_INTERVAL)
+
+    def add_hud_box(self, name, obj, fields):
+        box = HudBox(name, obj, fields, self.sampler)
+        self.hud_table.add_member_sprite(box)
+
+        return box
+
+    # the box's fields leave the sampler when the box is killed. The
+    # other boxes are laid out again without being added to the
+    # container again
+    def remove_hud_box(self, box):
+        table = self.hud_table
+        members = [m for m in table.member_list if m is not box]
+
+        box.kill()
+        table.member_table = table.get_table(members)
+        table.handle_event("change_member_size")
+
+    # shows the slowest timers of the frame profiler, as their average
+    # and 90th percentile times
+    def add_profiler_box(self, profiler):
+        def get_field(rank):
+            return "#{}".format(rank + 1), lambda p: p.get_summary(rank)
+
+        return self.add_hud_box("Frame profiler", profiler, [
+            get_field(i) for i in range(DebugLayer.PROFILER_ROWS)
+        ])
+
+    # the profiler box is only in the HUD while the profiler is enabled,
+    # however it was turned on or off
+    def update_profiler_box(self):
+        enabled = self.profiler.enabled
+        box = self.profiler_box
+
+        if enabled and not box:
+            self.profiler_box = self.add_profiler_box(self.profiler)
+
+        elif box and not enabled:
+            self.remove_hud_box(box)
+            self.profiler_box = None
+
+    # the HUD is only sampled while it can be seen
+    def update(self):
+        super(DebugLayer, self).update()
+        self.update_profiler_box()
+
+        if self.visible:
+            self.sampler.update()
+
+
+class HudSampler:
+    """
+    A HudSampler updates the text of every HudField of a DebugLayer on
+    one shared cadence, instead of each field having its own timer.
+    Each field is sampled once every 'interval' frames. With spread set
+    the fields are split into 'interval' slices and one slice is sampled
+    each frame, so the HUD costs about the same every frame; otherwise
+    every field is sampled on the same frame.
+
+    A field's text is only changed (and rendered) when the sampled
+    string differs from the one it's showing.
+    """
+    def __init__(self, name, interval, spread=True):
+        self.name = name
+        self.interval = interval
+        self.spread = spread
+        self.fields = []
+        self.frame = 0
 
-    def add_hud_box(self, name, obj, fields, interval=5):
-        self.hud_table.add_member_sprite(
-            HudBox(name, obj, fields, interval)
-        )
+    def __repr__(self):
+        return "HudSampler '{}' with {} fields".format(
+            self.name, len(self.fields))
+
+    def add_field(self, field):
+        if field not in self.fields:
+            self.fields.append(field)
+
+    def remove_field(self, field):
+        if field in self.fields:
+            self.fields.remove(field)
+
+    def get_fields(self, frame):
+        interval = self.interval
+        i = frame % interval
+
+        if self.spread:
+            return self.fields[i::interval]
+
+        if i == 0:
+            return self.fields
+
+        return []
 
     def update(self):
-        super(DebugLayer, self).update()
+        for field in self.get_fields(self.frame):
+            field.sample()
+
+        self.frame += 1
 
 
 class HudBox(ContainerSprite):
-    def __init__(self, name, obj, fields, interval=5, **kwargs):
+    def __init__(self, name, obj, fields, sampler, **kwargs):
         kwargs.update({"align_h": "c"})
         super(HudBox, self).__init__(
             name + " HUD", title=name,
             **kwargs)
 
         self.object = obj
-        self.interval = interval
+        self.sampler = sampler
         self.set_up_huds(fields)
 
     def set_up_huds(self, fields):
@@ -760,12 +919,7 @@ class HudBox(ContainerSprite):
             self.add_field(self.object, field)
 
     def add_field(self, obj, field):
-        text_field = HudField(obj, field)
-        self.add_timer(
-            "HUD update frequency", self.interval,
-            on_switch_off=text_field.set_text,
-            temp=False)
-
+        text_field = HudField(obj, field, sampler=self.sampler)
         self.add_member_sprite(text_field)
 
 
@@ -774,11 +928,34 @@ class HudField(TextSprite):
     T_STR = "({:3.1f}, {:3.1f})"
     F_STR = "{:3.1f}"
 
-    def __init__(self, obj, field, **kwargs):
+    def __init__(self, obj, field, sampler=None, **kwargs):
         super(HudField, self).__init__("", **kwargs)
+        # HUD values change every few frames, so they're laid out
+        # from a glyph atlas instead of rendered with font.render()
+        self.style = {"fonts": {"main": "dev_main_bitmap"}}
 
         self.cache = None
         self.func = self.get_func(obj, field)
+        self.sampler = sampler
+
+    # a field is sampled from when it spawns until it dies or is killed
+    def on_spawn(self):
+        super(HudField, self).on_spawn()
+
+        if self.sampler:
+            self.sampler.add_field(self)
+
+    def on_death(self):
+        super(HudField, self).on_death()
+
+        if self.sampler:
+            self.sampler.remove_field(self)
+
+    def kill(self):
+        super(HudField, self).kill()
+
+        if self.sampler:
+            self.sampler.remove_field(self)
 
     def get_func(self, obj, field):
         value_name = field[0]
@@ -818,8 +995,11 @@ class HudField(TextSprite):
     def update(self):
         super(HudField, self).update()
 
-    def set_text(self):
-        self.change_text(self.func())
+    def sample(self):
+        text = self.func()
+
+        if text != self.text:
+            self.change_text(text)
 
     def get_f_text(self, lhs, value):
         if type(value) is tuple: